@@ -1,7 +1,10 @@
 """
 PyGUI is an easy to use gui.
 """
-from .window import Window
+from .window import Input, Window
 from .elements import Elements
+from .document import Document
+from .images import RawImage
+from .log import Log
 
-__all__ = ["Window", "Elements"]
+__all__ = ["Window", "Elements", "Document", "Input", "Log", "RawImage"]
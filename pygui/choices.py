@@ -0,0 +1,64 @@
+"""
+File for searching through long lists of choices.
+"""
+import bisect
+from typing import List, Sequence
+
+
+class ChoiceIndex:
+    """
+    A search index for a list of choices. Matches are case insensitive, with prefix matches first.
+    """
+
+    choices: Sequence[str]
+
+    def __init__(self, choices: Sequence[str]) -> None:
+        self.choices = choices
+        self._lowered = [choice.lower() for choice in choices]
+        self._sorted = sorted(range(len(choices)), key=self._lowered.__getitem__)
+        self._sorted_keys = [self._lowered[index] for index in self._sorted]
+        self._text = ""
+        self._contains = list(range(len(choices)))
+        self._matches = self._contains
+
+    def search(self, text: str) -> List[int]:
+        """
+        Find the choices containing the text. The result of the last search is reused.
+
+        Parameters
+        ----------
+        text : str
+            The text to search for.
+
+        Returns
+        -------
+        List[int]
+            The indexes of the matching choices. Choices starting with the text come first.
+        """
+        text = text.lower()
+        if text == self._text:
+            return self._matches
+
+        if not text:
+            contains = list(range(len(self.choices)))
+            matches = contains
+        else:
+            # Typing more only removes matches, so only the last matches are searched again.
+            if self._text and text.startswith(self._text):
+                candidates = self._contains
+            else:
+                candidates = range(len(self.choices))
+            contains = [index for index in candidates if text in self._lowered[index]]
+            start = bisect.bisect_left(self._sorted_keys, text)
+            end = bisect.bisect_left(self._sorted_keys, text + "\U0010ffff")
+            prefix = sorted(self._sorted[start:end])
+            prefix_set = set(prefix)
+            matches = prefix + [index for index in contains if index not in prefix_set]
+
+        self._text = text
+        self._contains = contains
+        self._matches = matches
+        return matches
+
+    def __len__(self) -> int:
+        return len(self.choices)
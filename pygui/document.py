@@ -0,0 +1,113 @@
+"""
+File for the text buffer behind the text editor element.
+"""
+import threading
+from typing import Iterable, List, Optional
+
+
+class Document:
+    """
+    An editable text, stored as a list of lines.
+
+    Edits replace a range of lines, so changing a line of a large document doesn't copy the rest of it.
+    The full text is only joined when it is read, and kept until the next edit.
+    Reading the text is safe while another thread edits the document, so it can be saved in the background.
+    """
+
+    version: int
+
+    def __init__(self, text: str = "") -> None:
+        self._lines: List[str] = text.split("\n")
+        self._text: Optional[str] = text
+        self.version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def text(self) -> str:
+        """
+        The full text.
+
+        Returns
+        -------
+        str
+            The lines joined with newlines.
+        """
+        with self._lock:
+            if self._text is None:
+                self._text = "\n".join(self._lines)
+            return self._text
+
+    @text.setter
+    def text(self, text: str) -> None:
+        lines = text.split("\n")
+        with self._lock:
+            self._lines = lines
+            self._text = text
+            self.version += 1
+
+    def line(self, index: int) -> str:
+        """
+        Get a line.
+
+        Parameters
+        ----------
+        index : int
+            The number of the line, starting at 0.
+
+        Returns
+        -------
+        str
+            The line without its newline.
+        """
+        return self._lines[index]
+
+    def lines(self, start: int, stop: int) -> List[str]:
+        """
+        Get a range of lines.
+
+        Parameters
+        ----------
+        start : int
+            The first line.
+        stop : int
+            The line after the last one.
+
+        Returns
+        -------
+        List[str]
+            The lines without their newlines.
+        """
+        return self._lines[start:stop]
+
+    def replace(self, start: int, stop: int, lines: Iterable[str]) -> None:
+        """
+        Replace a range of lines. The new lines can be more or fewer than the old ones.
+
+        Parameters
+        ----------
+        start : int
+            The first line to replace.
+        stop : int
+            The line after the last one to replace. This is the same as start to insert lines.
+        lines : Iterable[str]
+            The new lines, without newlines.
+        """
+        lines = list(lines)
+        with self._lock:
+            self._lines[start:stop] = lines
+            if not self._lines:
+                self._lines.append("")
+            self._text = None
+            self.version += 1
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __reduce__(self):
+        return (Document, (self.text,))
+
+    def __repr__(self) -> str:
+        return f"Document(lines={len(self._lines)}, version={self.version})"
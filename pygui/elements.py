@@ -1,14 +1,51 @@
 """
 Elements for the gui to display.
 """
-import collections.abc
+import collections
+import contextlib
+import fnmatch
+import functools
 import math
-import warnings
-from typing import List, Optional, Union
+import threading
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
-import imgui
+from pygui.choices import ChoiceIndex
+from pygui.document import Document
+from pygui.images import TextureCache
+from pygui.lazy import lazy_import
+from pygui.log import Log
+from pygui.plot import downsample
+from pygui.tasks import Tasks
+from pygui.text import TextCache
+
+imgui = lazy_import("imgui")
 
 WRAPPING_PERCENTAGE = 0.9
+SPINNER = ("|", "/", "-", "\\")
+SPINNER_SPEED = 10
+MEMO_SIZE = 128
+DEFAULT_FONT_SIZE = 48
+EDITOR_HEADROOM = 1 << 16
+
+
+def _call(func):
+    func()
+
+
+def _skip(func):
+    pass
 
 
 def hex_to_rgb(hex_value: int) -> tuple:
@@ -49,40 +86,349 @@ def clamp(number: int, minimum: int, maximum: int):
     return max(minimum, min(number, maximum))
 
 
-class State(collections.abc.MutableMapping, dict):  # type: ignore
+def same_values(first: tuple, second: tuple) -> bool:
+    """
+    Check if two tuples hold the same values. Values are compared by identity first, so arrays can be used.
+
+    Parameters
+    ----------
+    first : tuple
+        The first values.
+    second : tuple
+        The second values.
+
+    Returns
+    -------
+    bool
+        If the values are the same.
+    """
+    if len(first) != len(second):
+        return False
+    for first_value, second_value in zip(first, second):
+        if first_value is second_value:
+            continue
+        try:
+            if not first_value == second_value:
+                return False
+        except ValueError:  # Comparing arrays gives an array, which has no truth value.
+            return False
+    return True
+
+
+class ClickTime(float):
+    """
+    The imgui time a button was clicked. It is not saved by persistence, since imgui's clock starts again with every window.
+    """
+
+    __slots__ = ()
+
+
+class Color(tuple):
+    """
+    An RGB or RGBA color. Red, green and blue are between 0 and 255, alpha is between 0 and 1.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, red: int, green: int, blue: int, alpha: Optional[float] = None):
+        return tuple.__new__(
+            cls, (red, green, blue) if alpha is None else (red, green, blue, alpha)
+        )
+
+    def __getnewargs__(self):
+        return tuple(self)
+
+    @classmethod
+    def from_value(cls, value: Union[int, tuple]) -> "Color":
+        """
+        Create a color from a HEX or RGB(A) value.
+
+        Parameters
+        ----------
+        value : Union[int, tuple]
+            The HEX (like ``0xFF0000``) or RGB(A) (like ``(255, 0, 0, 1)``) value.
+
+        Returns
+        -------
+        Color
+            The color.
+        """
+        if isinstance(value, Color):
+            return value
+        if isinstance(value, int):
+            return cls(*hex_to_rgb(value))
+        return cls(*value)
+
+    @classmethod
+    def from_floats(cls, value: tuple) -> "Color":
+        """
+        Create a color from values between 0 and 1, like the ones imgui uses.
+
+        Parameters
+        ----------
+        value : tuple
+            The RGB(A) value with every channel between 0 and 1.
+
+        Returns
+        -------
+        Color
+            The color.
+        """
+        return cls(
+            round(value[0] * 255), round(value[1] * 255), round(value[2] * 255), *value[3:]
+        )
+
+    def to_floats(self) -> tuple:
+        """
+        Convert the color to values between 0 and 1, like the ones imgui uses.
+
+        Returns
+        -------
+        tuple
+            The RGB(A) value with every channel between 0 and 1.
+        """
+        return (self[0] / 255, self[1] / 255, self[2] / 255) + self[3:]
+
+    def rgb(self) -> "Color":
+        """
+        Get the color without the alpha value.
+
+        Returns
+        -------
+        Color
+            The RGB color.
+        """
+        return self if len(self) == 3 else Color(self[0], self[1], self[2])
+
+    def rgba(self) -> "Color":
+        """
+        Get the color with an alpha value. If the color has none the alpha will be 1.
+
+        Returns
+        -------
+        Color
+            The RGBA color.
+        """
+        return self if len(self) == 4 else Color(self[0], self[1], self[2], 1)
+
+
+class State(dict):
     """
     The state object.
+
+    Values are stored as they are given, so reading a value is a plain dictionary lookup.
+    Other threads should use ``post`` or ``batch``, which are applied at the start of the next frame.
     """
 
-    convert: bool = True
+    version: int = 0
+    on_post: Optional[Callable] = None
+    # The version at which every key was last changed. Only kept once ``track_changes`` was called.
+    modified: Optional[Dict[Any, int]] = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._posted = {}
+        self._lock = threading.Lock()
+        self._subscriptions: List[Tuple[Any, Callable]] = []
+        self._watchers: Dict[Any, Tuple[Callable, ...]] = {}
+        self._changed: Dict[Any, Any] = {}
+
+    def track_changes(self) -> None:
+        """
+        Start remembering the version at which every key is changed, so changes can be found without comparing values.
+        """
+        if self.modified is None:
+            self.modified = {}
+
+    def on_change(self, key, callback: Callable[[Any, Any, Any], None]) -> Callable[[], None]:
+        """
+        Call a function once per frame when a key changed. It is called with the key, the value at the start of the frame and the new value.
+
+        Parameters
+        ----------
+        key : Any
+            The key to watch. Strings can be patterns like ``"volume.*"``.
+        callback : Callable[[Any, Any, Any], None]
+            The function to call. Missing values are passed as None.
+
+        Returns
+        -------
+        Callable[[], None]
+            A function that removes the subscription.
+        """
+        subscription = (key, callback)
+        self._subscriptions.append(subscription)
+        self._watchers.clear()
+
+        def unsubscribe():
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+                self._watchers.clear()
+
+        return unsubscribe
+
+    def _watchers_of(self, key) -> Tuple[Callable, ...]:
+        """
+        Get the callbacks subscribed to a key. They are looked up once and cached until the subscriptions change.
+
+        Parameters
+        ----------
+        key : Any
+            The key that changed.
 
-    def __getitem__(self, key):
-        value = dict.__getitem__(self, key)
-        if self.convert and isinstance(value, tuple) and len(value) in (3, 4):
-            return tuple(round(i * 255) for i in value[:3]) + (
-                (value[3],) if len(value) == 4 else ()
+        Returns
+        -------
+        Tuple[Callable, ...]
+            The callbacks.
+        """
+        watchers = self._watchers.get(key)
+        if watchers is None:
+            watchers = self._watchers[key] = tuple(
+                callback
+                for pattern, callback in self._subscriptions
+                if pattern == key
+                or (
+                    isinstance(pattern, str)
+                    and isinstance(key, str)
+                    and fnmatch.fnmatchcase(key, pattern)
+                )
             )
+        return watchers
 
-        return value
+    def _record(self, key) -> None:
+        """
+        Remember the value of a key before its first change in this frame, if anything is subscribed to it.
+
+        Parameters
+        ----------
+        key : Any
+            The key that is about to change.
+        """
+        if key not in self._changed and self._watchers_of(key):
+            self._changed[key] = dict.get(self, key)
+
+    def notify(self) -> None:
+        """
+        Call the subscribers of the keys that changed. The window calls this at the end of every frame.
+
+        Keys that were changed back to the value they had at the start of the frame are skipped.
+        """
+        if not self._changed:
+            return
+        changed, self._changed = self._changed, {}
+        for key, old_value in changed.items():
+            new_value = dict.get(self, key)
+            if same_values((old_value,), (new_value,)):
+                continue
+            for callback in self._watchers_of(key):
+                callback(key, old_value, new_value)
+
+    def post(self, key, value) -> None:
+        """
+        Set a value from any thread. It is applied at the start of the next frame.
+
+        If the same key is posted more than once before that, only the last value is applied.
+
+        Parameters
+        ----------
+        key : Any
+            The key to set.
+        value : Any
+            The value to set.
+        """
+        with self._lock:
+            self._posted[key] = value
+        if self.on_post is not None:
+            self.on_post()
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[dict]:
+        """
+        Set several values from any thread. They are applied together at the start of the next frame.
+
+        Yields
+        ------
+        dict
+            A dictionary to put the values in.
+        """
+        values = {}
+        yield values
+        if values:
+            with self._lock:
+                self._posted.update(values)
+            if self.on_post is not None:
+                self.on_post()
+
+    def apply_posted(self) -> None:
+        """
+        Apply the posted values. The window calls this at the start of every frame.
+        """
+        if not self._posted:
+            return
+        with self._lock:
+            posted, self._posted = self._posted, {}
+        self.update(posted)
 
     def __setitem__(self, key, value):
-        if self.convert and isinstance(value, tuple) and len(value) in (3, 4):
-            value = tuple(i / 255 for i in value[:3]) + (
-                (value[3],) if len(value) == 4 else ()
-            )
+        if self._subscriptions:
+            self._record(key)
         dict.__setitem__(self, key, value)
+        self.version += 1
+        if self.modified is not None:
+            self.modified[key] = self.version
 
     def __delitem__(self, key):
+        if self._subscriptions:
+            self._record(key)
         dict.__delitem__(self, key)
+        self.version += 1
+        if self.modified is not None:
+            self.modified[key] = self.version
 
-    def __iter__(self):
-        return dict.__iter__(self)
+    def setdefault(self, key, default=None):
+        if key in self:
+            return dict.__getitem__(self, key)
+        self[key] = default
+        return default
 
-    def __len__(self):
-        return dict.__len__(self)
+    def update(self, *args, **kwargs):
+        if self._subscriptions or self.modified is not None:
+            values = dict(*args, **kwargs)
+            if self._subscriptions:
+                for key in values:
+                    self._record(key)
+            args, kwargs = (values,), {}
+        dict.update(self, *args, **kwargs)
+        self.version += 1
+        if self.modified is not None:
+            self.modified.update(dict.fromkeys(args[0], self.version))
 
-    def __contains__(self, x):
-        return dict.__contains__(self, x)
+    def pop(self, *args):
+        if self._subscriptions and args[0] in self:
+            self._record(args[0])
+        value = dict.pop(self, *args)
+        self.version += 1
+        if self.modified is not None:
+            self.modified[args[0]] = self.version
+        return value
+
+    def popitem(self):
+        if self._subscriptions and self:
+            self._record(next(reversed(self)))
+        item = dict.popitem(self)
+        self.version += 1
+        if self.modified is not None:
+            self.modified[item[0]] = self.version
+        return item
+
+    def clear(self):
+        if self._subscriptions:
+            for key in self:
+                self._record(key)
+        if self.modified is not None:
+            self.modified.update(dict.fromkeys(self, self.version + 1))
+        dict.clear(self)
+        self.version += 1
 
 
 class Elements:
@@ -90,10 +436,87 @@ class Elements:
     A class full of elements that can be added to the gui.
     """
 
+    __slots__ = (
+        "state",
+        "fonts",
+        "tasks",
+        "textures",
+        "texts",
+        "cache",
+        "next_redraw",
+        "replaying",
+        "clicks",
+    )
+
     state: State
+    fonts: Dict[int, object]
+    tasks: Tasks
+    textures: TextureCache
+    texts: TextCache
+    cache: Dict[tuple, Any]
+    next_redraw: float
+    replaying: bool
+    clicks: Set[str]
 
-    def __init__(self, state: State) -> None:
+    def __init__(
+        self,
+        state: State,
+        fonts: Optional[Dict[int, object]] = None,
+        tasks: Optional[Tasks] = None,
+        textures: Optional[TextureCache] = None,
+    ) -> None:
         self.state = state
+        self.fonts = {} if fonts is None else fonts
+        self.tasks = Tasks() if tasks is None else tasks
+        self.textures = TextureCache(self.tasks) if textures is None else textures
+        self.texts = TextCache()
+        self.cache = {}
+        self.next_redraw = math.inf
+        self.replaying = False
+        self.clicks = set()
+
+    def reset(self) -> None:
+        """
+        Reset the per render values, so the elements can be reused for the next render.
+        """
+        self.next_redraw = math.inf
+
+    @staticmethod
+    def _begin_clipping(count: int) -> Tuple[int, int]:
+        """
+        Find the lines of a scrolling list that are in view, and add space for the lines above them.
+
+        Parameters
+        ----------
+        count : int
+            How many lines the list has.
+
+        Returns
+        -------
+        Tuple[int, int]
+            The first line in view and the line after the last one in view.
+        """
+        line_height = imgui.get_text_line_height_with_spacing()
+        first = min(int(imgui.get_scroll_y() // line_height), count)
+        last = min(first + int(imgui.get_window_height() // line_height) + 2, count)
+        if first > 0:
+            imgui.dummy(0, first * line_height)
+        return first, last
+
+    @staticmethod
+    def _end_clipping(count: int, last: int) -> None:
+        """
+        Add space for the lines below the ones in view.
+
+        Parameters
+        ----------
+        count : int
+            How many lines the list has.
+        last : int
+            The line after the last one in view.
+        """
+        if last < count:
+            imgui.dummy(0, (count - last) * imgui.get_text_line_height_with_spacing())
 
     def text(
         self,
@@ -101,7 +524,7 @@ class Elements:
         text_color: Optional[Union[tuple, int]] = None,
         center: bool = False,
         wrap_text: bool = True,
-        font_size: Union[int, float] = 48,
+        font_size: Union[int, float] = DEFAULT_FONT_SIZE,
     ) -> None:
         """
         Add's a text element to the GUI.
@@ -117,40 +540,45 @@ class Elements:
         wrap_text : bool, optional
             Wether or not the text should be wrapped, by default True
         font_size : Union[int, float], optional
-            The font size of the text, by default 48
+            The font size of the text. The closest size loaded by the window is used, by default 48
         """
-        if center and wrap_text:
-            warnings.warn(
-                "Cannot center text and wrap text at the same time (yet). Center will be set to false."
-            )
-            center = False
-        if isinstance(text_color, int):
-            text_color = hex_to_rgb(text_color)
-        if isinstance(text_color, tuple):
-            if len(text_color) == 3:
-                text_color = text_color + (1,)
+        if text_color is not None:
             imgui.push_style_color(
-                imgui.COLOR_TEXT,
-                text_color[0] / 255,
-                text_color[1] / 255,
-                text_color[2] / 255,
-                text_color[3],
+                imgui.COLOR_TEXT, *Color.from_value(text_color).rgba().to_floats()
             )
+        if wrap_text and not center:
+            imgui.push_text_wrap_pos(imgui.get_window_width() * WRAPPING_PERCENTAGE)
+        font = None
+        scale = font_size / DEFAULT_FONT_SIZE
+        if self.fonts:
+            size = min(self.fonts, key=lambda size: abs(size - font_size))
+            scale = font_size / size
+            # The window pushes the loaded font closest to the default size, which is not always 48.
+            if size != min(self.fonts, key=lambda size: abs(size - DEFAULT_FONT_SIZE)):
+                font = self.fonts[size]
+                imgui.push_font(font)
+        if scale != 1:
+            imgui.set_window_font_scale(scale)
         if center:
             window_width = imgui.get_window_width()
-            text_width = imgui.calc_text_size(text).x
-
-            imgui.set_cursor_pos_x((window_width - text_width) / 2)
-        if wrap_text:
-            imgui.push_text_wrap_pos(imgui.get_window_width() * WRAPPING_PERCENTAGE)
-        if font_size != 48:
-            imgui.set_window_font_scale(font_size / 48)
-        imgui.text(text)
-        if font_size != 48:
+            if wrap_text:
+                # Every wrapped line is centered on its own, using the cached layout.
+                layout = self.texts.get(text, font, window_width * WRAPPING_PERCENTAGE)
+                for line, line_width in layout.lines:
+                    imgui.set_cursor_pos_x((window_width - line_width) / 2)
+                    imgui.text(line)
+            else:
+                imgui.set_cursor_pos_x((window_width - self.texts.get(text, font).width) / 2)
+                imgui.text(text)
+        else:
+            imgui.text(text)
+        if scale != 1:
             imgui.set_window_font_scale(1.0)
-        if isinstance(text_color, tuple):
+        if font is not None:
+            imgui.pop_font()
+        if text_color is not None:
             imgui.pop_style_color()
-        if wrap_text:
+        if wrap_text and not center:
             imgui.pop_text_wrap_pos()
 
     def button(
@@ -159,6 +587,7 @@ class Elements:
         text_color: Optional[Union[tuple, int]] = None,
         wrap_text: bool = True,
         key: Optional[str] = None,
+        background: bool = False,
     ):
         """
         Create a button element.
@@ -173,6 +602,8 @@ class Elements:
             Wether or not the text should be wrapped to fit, by default True
         key : str, optional
             A key for the color picker. This can be used for accessing the state of the element before it is added to the frame, by default None
+        background : bool, optional
+            Run the click handler in the background, so it does not freeze the window. Clicks are ignored while it is running, by default False
 
 
         Returns
@@ -180,36 +611,79 @@ class Elements:
         Callable
             A decorator for handling the click event.
         """
+        clicked = self.button_clicked(text, text_color, wrap_text, key)
+        if not clicked:
+            return _skip
+        if background:
+            if self.tasks.is_running(key or text):
+                return _skip
+
+            def background_handler(func):
+                self.tasks.submit(func, key=key or text)
+
+            return background_handler
+        return _call
+
+    def button_clicked(
+        self,
+        text: str,
+        text_color: Optional[Union[tuple, int]] = None,
+        wrap_text: bool = True,
+        key: Optional[str] = None,
+    ) -> bool:
+        """
+        Create a button element without a decorator.
+
+        Parameters
+        ----------
+        text : str
+            The text to be displayed on the button.
+        text_color : Union[tuple, int], optional
+            The color of the text, either RGB or HEX, by default (255, 255, 255, 1)
+        wrap_text : bool, optional
+            Wether or not the text should be wrapped to fit, by default True
+        key : str, optional
+            A key for the button. This can be used for accessing the state of the element before it is added to the frame, by default None
+
+        Returns
+        -------
+        bool
+            If the button was clicked.
+        """
+        label = text
         if wrap_text:
-            imgui.push_text_wrap_pos(imgui.get_window_width() * WRAPPING_PERCENTAGE)
-        if isinstance(text_color, int):
-            text_color = hex_to_rgb(text_color)
-        if isinstance(text_color, tuple):
-            if len(text_color) == 3:
-                text_color = text_color + (1,)
+            # imgui doesn't wrap button labels, so the lines of the cached layout are joined instead.
+            wrap_width = (
+                imgui.get_window_width() * WRAPPING_PERCENTAGE
+                - imgui.get_cursor_pos_x()
+                - imgui.get_style().frame_padding.x * 2
+            )
+            layout = self.texts.get(text, None, wrap_width)
+            if len(layout.lines) > 1:
+                label = "\n".join(line for line, _ in layout.lines) + "###" + text
+        if text_color is not None:
             imgui.push_style_color(
-                imgui.COLOR_TEXT,
-                text_color[0] / 255,
-                text_color[1] / 255,
-                text_color[2] / 255,
-                text_color[3],
+                imgui.COLOR_TEXT, *Color.from_value(text_color).rgba().to_floats()
             )
         if key:
             imgui.push_id(key)
-        clicked = imgui.button(text)
+        clicked = imgui.button(label)
         if key:
             imgui.pop_id()
-        if wrap_text:
-            imgui.pop_text_wrap_pos()
-        if isinstance(text_color, tuple):
+        if text_color is not None:
             imgui.pop_style_color()
 
-        def button_handler(func):
+        if self.replaying:
+            # A throttled frame function is not running, so the click is handed to its next run.
             if clicked:
-                self.state[key or text] = imgui.get_time()
-                func()
-
-        return button_handler
+                self.clicks.add(key or text)
+            return clicked
+        if (key or text) in self.clicks:
+            self.clicks.discard(key or text)
+            clicked = True
+        if clicked:
+            self.state[key or text] = ClickTime(imgui.get_time())
+        return clicked
 
     def button_event(self, key: str, time_limit: int = 10, delay: int = 0):
         """
@@ -229,12 +703,285 @@ class Elements:
         Callable
             A decorator for handling element's that only get rendered after a button click.
         """
+        return _call if self.button_event_active(key, time_limit, delay) else _skip
+
+    def button_event_active(self, key: str, time_limit: int = 10, delay: int = 0) -> bool:
+        """
+        Check if a button event is running without a decorator.
+
+        Parameters
+        ----------
+        key : str
+            The key of the button.
+        time_limit : int, optional
+            How long the event runs after the button's click, by default 10
+        delay : int, optional
+            How long after the button's click the event starts, by default 0
+
+        Returns
+        -------
+        bool
+            If the event is running.
+        """
+        start = self.state.get(key, -math.inf) + delay
+        now = imgui.get_time()
+        if now <= start + time_limit:
+            # The event is pending or running, so the window has to keep redrawing.
+            self.next_redraw = min(self.next_redraw, max(start, now))
+        return start <= now <= start + time_limit
+
+    def plot(
+        self,
+        key: str,
+        data: Any,
+        height: int = 200,
+        width: int = 0,
+        scale_min: Optional[float] = None,
+        scale_max: Optional[float] = None,
+        overlay_text: str = "",
+        version: Any = None,
+    ) -> None:
+        """
+        Create a line plot. Data longer than the plot is wide is downsampled to the minimum and maximum of every pixel.
+
+        Parameters
+        ----------
+        key : str
+            A key for the plot. The downsampled data is cached under it.
+        data : Any
+            The values to plot. float32 NumPy arrays and ``array.array("f")`` are used without copying.
+        height : int, optional
+            The height of the plot, by default 200
+        width : int, optional
+            The width of the plot. 0 fills the width of the frame, by default 0
+        scale_min : float, optional
+            The lowest value on the plot. None uses the lowest value of the data, by default None
+        scale_max : float, optional
+            The highest value on the plot. None uses the highest value of the data, by default None
+        overlay_text : str, optional
+            Text to display on top of the plot, by default ""
+        version : Any, optional
+            Change this when the data changes in place, so the cached downsampled data is rebuilt, by default None
+        """
+        if width <= 0:
+            width = imgui.get_content_region_available().x
+        buckets = max(int(width), 1)
+        identity = (len(data), version, buckets)
+        cached = self.cache.get(("plot", key))
+        if cached is None or cached[0] is not data or cached[1] != identity:
+            cached = self.cache[("plot", key)] = (data, identity, *downsample(data, buckets))
+        _, _, values, minimum, maximum = cached
+
+        if values is not None and len(values) == 0:
+            # imgui can't plot an empty buffer.
+            imgui.dummy(width, height)
+            return
+
+        imgui.push_id(key)
+        view = None
+        if values is None:
+            # Short float32 data is not cached. Its buffer is only borrowed while it is plotted.
+            values = view = memoryview(data)
+        imgui.plot_lines(
+            "##plot",
+            values,
+            overlay_text=overlay_text,
+            scale_min=minimum if scale_min is None else scale_min,
+            scale_max=maximum if scale_max is None else scale_max,
+            graph_size=(width, height),
+        )
+        if view is not None:
+            view.release()
+        imgui.pop_id()
+
+    def progress(self, key: str, text: str = "Working", cancel: bool = True) -> bool:
+        """
+        Show a spinner while the background task with the key is running.
+
+        Parameters
+        ----------
+        key : str
+            The key of the task. For a background button this is its key or text.
+        text : str, optional
+            Text that will be displayed after the spinner, by default "Working"
+        cancel : bool, optional
+            Wether or not a cancel button should be displayed, by default True
+
+        Returns
+        -------
+        bool
+            If the task is still running.
+        """
+        if not self.tasks.is_running(key):
+            return False
+        now = imgui.get_time()
+        self.next_redraw = min(self.next_redraw, now)
+        imgui.text(f"{SPINNER[int(now * SPINNER_SPEED) % len(SPINNER)]} {text}")
+        if cancel:
+            imgui.same_line()
+            imgui.push_id(key)
+            if imgui.button("Cancel"):
+                self.tasks.cancel(key)
+            imgui.pop_id()
+        return self.tasks.is_running(key)
+
+    def schedule(
+        self, key: str, func: Callable[..., Awaitable], *args, default: Any = None
+    ) -> Any:
+        """
+        Run a coroutine function once on the running event loop and save its result in the state.
+
+        This only works when the window was started with ``Window.run_async``. Delete the key from the state to run it again.
+
+        Parameters
+        ----------
+        key : str
+            The key the result will be saved under in the state.
+        func : Callable[..., Awaitable]
+            The coroutine function to run.
+        *args
+            The arguments to pass to the function.
+        default : Any, optional
+            The value to return until the result is ready, by default None
+
+        Returns
+        -------
+        Any
+            The result of the coroutine, or the default value if it is not ready yet.
+        """
+        if key not in self.state and not self.tasks.is_running(key):
+            self.tasks.schedule(
+                func(*args), callback=functools.partial(self.state.__setitem__, key), key=key
+            )
+        return self.state.get(key, default)
+
+    def memo(
+        self, key: str, deps: tuple, func: Callable[[], Any], watch: Iterable[str] = ()
+    ) -> Any:
+        """
+        Call a function only when its dependencies change and return the cached result otherwise.
+
+        The last ``MEMO_SIZE`` results of every frame are kept, the least recently used ones are removed first.
+
+        Parameters
+        ----------
+        key : str
+            The key the result is cached under.
+        deps : tuple
+            The values the result depends on. The function is called again when one of them changes.
+        func : Callable[[], Any]
+            The function that computes the result.
+        watch : Iterable[str], optional
+            Keys of the state the result depends on, by default ()
+
+        Returns
+        -------
+        Any
+            The result of the function.
+        """
+        deps = tuple(deps) + tuple(self.state.get(watched) for watched in watch)
+        memos = self.cache.get(("memo",))
+        if memos is None:
+            memos = self.cache[("memo",)] = collections.OrderedDict()
+
+        cached = memos.get(key)
+        if cached is not None and same_values(cached[0], deps):
+            memos.move_to_end(key)
+            return cached[1]
+
+        result = func()
+        memos[key] = (deps, result)
+        memos.move_to_end(key)
+        if len(memos) > MEMO_SIZE:
+            memos.popitem(last=False)
+        return result
+
+    def image(
+        self,
+        source: Any,
+        width: int = 0,
+        height: int = 0,
+        pixel_size: Optional[Tuple[int, int]] = None,
+        version: Any = None,
+    ) -> bool:
+        """
+        Create an image. Image files are decoded in the background and the texture is cached.
+
+        Parameters
+        ----------
+        source : Any
+            A path to an image file, a ``RawImage`` or a buffer of RGBA pixels like a NumPy array.
+        width : int, optional
+            The width to display the image at. 0 uses the width of the image, by default 0
+        height : int, optional
+            The height to display the image at. 0 uses the height of the image, by default 0
+        pixel_size : Tuple[int, int], optional
+            The width and height of a buffer. Not needed for NumPy arrays shaped (height, width, 4), by default None
+        version : Any, optional
+            Change this when a buffer is changed in place, by default None
+
+        Returns
+        -------
+        bool
+            If the image is loaded. Until then, or if it could not be read, empty space is displayed.
+        """
+        texture = self.textures.get(source, pixel_size, version)
+        if texture is None:
+            imgui.dummy(width, height)
+            return False
+        imgui.image(texture.texture_id, width or texture.width, height or texture.height)
+        return True
+
+    def log_console(
+        self,
+        key: str,
+        max_lines: int = 10000,
+        height: int = 0,
+        autoscroll: bool = True,
+        show_filter: bool = True,
+    ) -> Log:
+        """
+        Create a scrolling log console. Only the lines that are on screen are drawn.
+
+        Parameters
+        ----------
+        key : str
+            The key the ``Log`` is saved under in the state. Other threads can add lines to it with ``append``.
+        max_lines : int, optional
+            How many lines are kept when the log is created. Older lines are removed, by default 10000
+        height : int, optional
+            The height of the console. 0 fills the rest of the frame, by default 0
+        autoscroll : bool, optional
+            Keep the newest line in view while the console is scrolled to the bottom, by default True
+        show_filter : bool, optional
+            Show an input that only shows lines containing its text, by default True
 
-        def handler(func):
-            if delay <= imgui.get_time() - self.state.get(key, -math.inf) <= time_limit + delay:
-                func()
+        Returns
+        -------
+        Log
+            The log of the console.
+        """
+        log = self.state.get(key)
+        if log is None:
+            log = self.state[key] = Log(max_lines)
+        if log.on_append is None:
+            # Lines added from other threads wake the window like posted state does.
+            log.on_append = self.state.on_post
 
-        return handler
+        imgui.push_id(key)
+        if show_filter:
+            _, log.filter = imgui.input_text(" Filter", log.filter, 256)
+        imgui.begin_child("log", 0, height, True)
+        visible = log.visible()
+        first, last = self._begin_clipping(visible)
+        for index in range(first, last):
+            imgui.text(log.visible_line(index))
+        self._end_clipping(visible, last)
+        if autoscroll and imgui.get_scroll_y() >= imgui.get_scroll_max_y():
+            imgui.set_scroll_here(1.0)
+        imgui.end_child()
+        imgui.pop_id()
+        return log
 
     def checkbox(
         self, label: str, default_value: bool, key: Optional[str] = None
@@ -296,37 +1043,25 @@ class Elements:
         tuple
             The currently selected color as an RGB or RGBA value. Vary's depending on wether alpha is set to true.
         """
-        self.state.convert = False
         func = imgui.color_edit4 if alpha else imgui.color_edit3
-        if isinstance(default_value, int):
-            default_value = hex_to_rgb(default_value)
-        if isinstance(default_value, tuple):
-            old_default_value = default_value
-            default_value = (
-                default_value[0] / 255,
-                default_value[1] / 255,
-                default_value[2] / 255,
-            )
-            if alpha:
-                if len(old_default_value) == 3:
-                    default_value = default_value + (1,)
-                else:
-                    default_value = default_value + (old_default_value[3],)
+        stored = self.state.get(key or label, default_value)
+        color = Color.from_value(stored)
+        color = color.rgba() if alpha else color.rgb()
+        if not isinstance(stored, Color):
+            # The state always holds a Color, also before the color was changed.
+            self.state[key or label] = color
         if key:
             imgui.push_id(key)
         changed, value = func(
             " " + label,  # Adding a space to the label make's it look better
-            *self.state.setdefault(key or label, default_value),
+            *color.to_floats(),
         )
         if key:
             imgui.pop_id()
         if changed:
-            self.state[key or label] = value
-        rgb = (round(value[0] * 255), round(value[1] * 255), round(value[2] * 255))
-        if alpha and len(value) == 4:
-            rgb = rgb + (value[3],)
-        self.state.convert = True
-        return rgb
+            color = Color.from_floats(value)
+            self.state[key or label] = color
+        return color
 
     def input_int(
         self,
@@ -470,6 +1205,117 @@ class Elements:
             self.state[key or label] = value
         return value
 
+    def text_editor(
+        self,
+        key: str,
+        default_value: str = "",
+        height: int = 0,
+        read_only: bool = False,
+    ) -> Document:
+        """
+        Create a multiline text editor for large texts. Only the lines that are on screen are drawn.
+
+        Clicking a line edits it, the arrow keys move to the line above or below. Enter and pasting can add lines while a line is edited.
+
+        Parameters
+        ----------
+        key : str
+            The key the ``Document`` is saved under in the state.
+        default_value : str, optional
+            The text of the document when it is created, by default ""
+        height : int, optional
+            The height of the editor. 0 fills the rest of the frame, by default 0
+        read_only : bool, optional
+            Wether or not the text can only be selected and copied, by default False
+
+        Returns
+        -------
+        Document
+            The document of the editor.
+        """
+        document = self.state.get(key)
+        if document is None:
+            document = self.state[key] = Document(default_value)
+        # The first edited line, how many lines are edited, if the input was active and if it should be focused.
+        editing = self.cache.setdefault(("text_editor", key), [None, 1, False, False])
+        start, size, was_active, focus = editing
+
+        imgui.push_id(key)
+        imgui.begin_child("text_editor", 0, height, True, imgui.WINDOW_HORIZONTAL_SCROLLING_BAR)
+        line_height = imgui.get_text_line_height_with_spacing()
+        count = len(document)
+        if start is not None and start >= count:
+            start, size = None, 1
+        origin = imgui.get_cursor_screen_pos()[1]
+
+        first = min(int(imgui.get_scroll_y() // line_height), count)
+        last = min(first + int(imgui.get_window_height() // line_height) + 2, count)
+        if start is not None and start < first < start + size:
+            first = start
+        if first > 0:
+            imgui.dummy(0, first * line_height)
+        active = False
+        index = first
+        while index < last:
+            if index != start:
+                imgui.text(document.line(index))
+                index += 1
+                continue
+            # Only the edited lines are given to imgui, with room to type or paste into.
+            value = "\n".join(document.lines(start, start + size))
+            if focus:
+                imgui.set_keyboard_focus_here()
+                focus = False
+            imgui.push_style_var(imgui.STYLE_FRAME_PADDING, (0, 0))
+            changed, value = imgui.input_text_multiline(
+                f"##line {start}",
+                value,
+                len(value.encode()) + EDITOR_HEADROOM,
+                -1,
+                size * line_height - imgui.get_style().item_spacing.y,
+                imgui.INPUT_TEXT_READ_ONLY if read_only else 0,
+            )
+            imgui.pop_style_var()
+            active = imgui.is_item_active()
+            if changed and not read_only:
+                lines = value.split("\n")
+                document.replace(start, start + size, lines)
+                self.state[key] = document
+                count += len(lines) - size
+                last = min(last + len(lines) - size, count)
+                size = len(lines)
+            index = start + size
+            if active:
+                was_active = True
+            elif was_active:
+                start, size, was_active = None, 1, False
+        if last < count:
+            imgui.dummy(0, (count - last) * line_height)
+
+        if active and size == 1:
+            for arrow, step in ((imgui.KEY_UP_ARROW, -1), (imgui.KEY_DOWN_ARROW, 1)):
+                if imgui.is_key_pressed(imgui.get_io().key_map[arrow], True) and 0 <= start + step < count:
+                    start, was_active, focus = start + step, False, True
+                    top = start * line_height
+                    if top < imgui.get_scroll_y():
+                        imgui.set_scroll_y(top)
+                    elif top + line_height > imgui.get_scroll_y() + imgui.get_window_height():
+                        imgui.set_scroll_y(top + line_height - imgui.get_window_height())
+                    break
+
+        if imgui.is_mouse_clicked(0) and imgui.is_window_hovered(
+            imgui.HOVERED_ALLOW_WHEN_BLOCKED_BY_ACTIVE_ITEM
+        ):
+            mouse_x, mouse_y = imgui.get_mouse_pos()
+            if mouse_x < imgui.get_window_position()[0] + imgui.get_window_content_region_max()[0]:
+                line = clamp(int((mouse_y - origin) // line_height), 0, count - 1)
+                if start is None or not start <= line < start + size:
+                    start, size, was_active, focus = line, 1, False, True
+        imgui.end_child()
+        imgui.pop_id()
+        editing[:] = start, size, was_active, focus
+        return document
+
     def combo(
         self,
         label: str,
@@ -513,3 +1359,79 @@ class Elements:
         if wrap_text:
             imgui.pop_text_wrap_pos()
         return value
+
+    def search_combo(
+        self,
+        label: str,
+        default_value: int,
+        choices: List[str],
+        key: Optional[str] = None,
+        wrap_text: bool = True,
+        height: int = 400,
+    ) -> int:
+        """
+        Create a combo element with a search box, for long lists of choices. Only the visible choices are drawn.
+
+        Parameters
+        ----------
+        label : str
+            The text to be displayed after the combo.
+        default_value : int
+            The default value of the combo. This should be the index of the choice in the choices list.
+        choices : List[str]
+            The list of choices to be displayed in the combo. The search index is built again when this is a different list or its length changes.
+        key : Optional[str], optional
+            A key for the combo. This can be used for accessing the state of the element before it is added to the frame, by default None
+        wrap_text : bool, optional
+            Wether or not the text should be wrapped to fit, by default True
+        height : int, optional
+            The height of the list of choices, by default 400
+
+        Returns
+        -------
+        int
+            The index of the selected value.
+        """
+        cached = self.cache.get(("search_combo", key or label))
+        if cached is None or cached[0] is not choices or len(cached[1]) != len(choices):
+            cached = self.cache[("search_combo", key or label)] = [choices, ChoiceIndex(choices), ""]
+        index = cached[1]
+
+        value = self.state.setdefault(key or label, default_value)
+        if wrap_text:
+            imgui.push_text_wrap_pos(imgui.get_window_width() * WRAPPING_PERCENTAGE)
+        if key:
+            imgui.push_id(key)
+        # pyimgui has no begin_combo, so the combo is a button that opens a popup.
+        width = imgui.calculate_item_width()
+        if imgui.button(
+            f"{choices[value] if 0 <= value < len(choices) else ''}##{label}", width
+        ):
+            imgui.open_popup(f"search_combo {label}")
+            cached[2] = ""
+        imgui.same_line()
+        imgui.text(" " + label)  # Adding a space to the label make's it look better
+        if imgui.begin_popup(f"search_combo {label}"):
+            if imgui.is_window_appearing():
+                imgui.set_keyboard_focus_here()
+            imgui.push_item_width(width)
+            _, cached[2] = imgui.input_text("##search", cached[2], 256)
+            imgui.pop_item_width()
+            matches = index.search(cached[2])
+
+            line_height = imgui.get_text_line_height_with_spacing()
+            imgui.begin_child("choices", width, min(height, len(matches) * line_height + 1))
+            first, last = self._begin_clipping(len(matches))
+            for choice in matches[first:last]:
+                if imgui.selectable(choices[choice], choice == value)[0]:
+                    value = choice
+                    self.state[key or label] = value
+                    imgui.close_current_popup()
+            self._end_clipping(len(matches), last)
+            imgui.end_child()
+            imgui.end_popup()
+        if key:
+            imgui.pop_id()
+        if wrap_text:
+            imgui.pop_text_wrap_pos()
+        return value
@@ -0,0 +1,245 @@
+"""
+File for loading images into textures and keeping them under a memory budget.
+"""
+import collections
+import mmap
+import os
+from typing import Any, Dict, Hashable, NamedTuple, Optional, OrderedDict, Set, Tuple
+
+from pygui.lazy import lazy_import
+from pygui.tasks import Tasks
+
+gl = lazy_import("OpenGL.GL")
+
+TEXTURE_BUDGET = 256 * 1024 * 1024
+
+
+class RawImage(NamedTuple):
+    """
+    A file of raw RGBA pixels. It is memory mapped instead of decoded.
+    """
+
+    path: str
+    width: int
+    height: int
+
+
+class Texture(NamedTuple):
+    """
+    An image that was uploaded to the GPU.
+    """
+
+    texture_id: int
+    width: int
+    height: int
+    size: int
+    source: Any = None
+
+
+def decode(source: Any) -> Tuple[Any, int, int]:
+    """
+    Read the pixels of an image file. This is run in the background.
+
+    Parameters
+    ----------
+    source : Any
+        A path to a PNG, JPEG or any other file Pillow can read, or a ``RawImage``.
+
+    Returns
+    -------
+    Tuple[Any, int, int]
+        The RGBA pixels, the width and the height.
+
+    Raises
+    ------
+    ImportError
+        If the image is not raw and Pillow is not installed.
+    """
+    if isinstance(source, RawImage):
+        with open(source.path, "rb") as file:
+            return (
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ),
+                source.width,
+                source.height,
+            )
+    try:
+        from PIL import Image  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise ImportError(
+            "Pillow is needed to load images, install it with `pip install pillow`"
+        ) from error
+    with Image.open(source) as image:
+        image = image.convert("RGBA")
+        return image.tobytes(), image.width, image.height
+
+
+class TextureCache:
+    """
+    Textures of the images that were displayed, removing the least recently used ones when they take up more than the budget.
+
+    Images that could not be read are kept in ``failed`` with their error, so they are not loaded again every frame.
+    Textures are only deleted by ``evict`` once the frame was rendered, and never while they are used by the current frame.
+    """
+
+    budget: int
+    used: int
+    textures: OrderedDict[Hashable, Texture]
+    failed: Dict[Hashable, BaseException]
+
+    def __init__(self, tasks: Tasks, budget: int = TEXTURE_BUDGET) -> None:
+        self.tasks = tasks
+        self.budget = budget
+        self.used = 0
+        self.upload = True
+        self.textures = collections.OrderedDict()
+        self.failed = {}
+        self._loading: Set[Hashable] = set()
+        self._drawn: Set[Hashable] = set()
+
+    def get(
+        self,
+        source: Any,
+        pixel_size: Optional[Tuple[int, int]] = None,
+        version: Any = None,
+    ) -> Optional[Texture]:
+        """
+        Get the texture of an image, starting to load it if it is not loaded yet.
+
+        Parameters
+        ----------
+        source : Any
+            A path to an image file, a ``RawImage`` or a buffer of RGBA pixels.
+        pixel_size : Tuple[int, int], optional
+            The width and height of a buffer. Not needed for NumPy arrays shaped (height, width, 4), by default None
+        version : Any, optional
+            Change this when a buffer is changed in place, by default None
+
+        Returns
+        -------
+        Optional[Texture]
+            The texture, or None while the image is being loaded or if it could not be read.
+        """
+        if isinstance(source, (str, os.PathLike, RawImage)):
+            path = source.path if isinstance(source, RawImage) else os.fspath(source)
+            try:
+                modified = os.stat(path).st_mtime_ns
+            except OSError as error:
+                # A missing file is looked for again every frame, so it is loaded once it exists.
+                self.failed[(path, None, version)] = error
+                return None
+            key = (source if isinstance(source, RawImage) else path, modified, version)
+            if key in self.failed:
+                return None
+        else:
+            key = (id(source), version)
+
+        texture = self.textures.get(key)
+        if texture is not None and (texture.source is None or texture.source is source):
+            self.textures.move_to_end(key)
+            self._drawn.add(key)
+            return texture
+
+        if isinstance(source, (str, os.PathLike, RawImage)):
+            if key not in self._loading:
+                self._loading.add(key)
+                self.tasks.submit(
+                    decode,
+                    source,
+                    callback=lambda decoded: self._add(key, *decoded),
+                    error_callback=lambda error: self._fail(key, error),
+                )
+            return None
+
+        # Buffers are already decoded, so they can be uploaded right away.
+        if pixel_size is None:
+            height, width = source.shape[:2]
+        else:
+            width, height = pixel_size
+        self._drawn.add(key)
+        return self._add(key, source, width, height, source)
+
+    def _fail(self, key: Hashable, error: BaseException) -> None:
+        self._loading.discard(key)
+        self.failed[key] = error
+
+    def _add(
+        self, key: Hashable, pixels: Any, width: int, height: int, source: Any = None
+    ) -> Texture:
+        """
+        Upload pixels to the GPU.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key of the texture.
+        pixels : Any
+            The RGBA pixels.
+        width : int
+            The width of the image.
+        height : int
+            The height of the image.
+        source : Any, optional
+            The buffer the pixels came from, by default None
+
+        Returns
+        -------
+        Texture
+            The texture.
+        """
+        self._loading.discard(key)
+        texture_id = 0
+        if self.upload:
+            texture_id = gl.glGenTextures(1)
+            gl.glBindTexture(gl.GL_TEXTURE_2D, texture_id)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
+            gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+            gl.glTexImage2D(
+                gl.GL_TEXTURE_2D,
+                0,
+                gl.GL_RGBA,
+                width,
+                height,
+                0,
+                gl.GL_RGBA,
+                gl.GL_UNSIGNED_BYTE,
+                memoryview(pixels),
+            )
+        if isinstance(pixels, mmap.mmap):
+            pixels.close()
+
+        texture = Texture(texture_id, width, height, width * height * 4, source)
+        self.textures[key] = texture
+        self.used += texture.size
+        return texture
+
+    def evict(self) -> None:
+        """
+        Delete the least recently used textures while the budget is exceeded. Call this after the frame was rendered.
+
+        Textures used since the last call are kept, even if they take up more than the budget together.
+        """
+        for key in list(self.textures):
+            if self.used <= self.budget:
+                break
+            if key not in self._drawn:
+                self._delete(self.textures.pop(key))
+        self._drawn.clear()
+
+    def _delete(self, texture: Texture) -> None:
+        self.used -= texture.size
+        if self.upload and texture.texture_id:
+            gl.glDeleteTextures([texture.texture_id])
+
+    def clear(self) -> None:
+        """
+        Delete every texture. This has to be called while the OpenGL context still exists.
+        """
+        while self.textures:
+            self._delete(self.textures.popitem()[1])
+        self._loading.clear()
+        self._drawn.clear()
+        self.failed.clear()
+
+    def __repr__(self) -> str:
+        return f"TextureCache(textures={len(self.textures)}, used={self.used}, budget={self.budget})"
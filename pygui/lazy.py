@@ -0,0 +1,55 @@
+"""
+File for importing the heavy dependencies only when they are first used.
+"""
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import a module the first time one of its attributes is used.
+
+    Parameters
+    ----------
+    name : str
+        The name of the module, like ``OpenGL.GL``.
+
+    Returns
+    -------
+    ModuleType
+        The module. It is loaded on the first attribute access.
+
+    Raises
+    ------
+    ModuleNotFoundError
+        If the module could not be found.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    if "." in name:
+        # Finding a submodule imports its package, so only the package is looked for now.
+        if importlib.util.find_spec(name.partition(".")[0]) is None:
+            raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+        return _Submodule(name)
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class _Submodule(ModuleType):
+    """
+    A submodule that is imported, together with its package, the first time one of its attributes is used.
+    """
+
+    def __getattr__(self, attribute: str):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attribute)
@@ -0,0 +1,185 @@
+"""
+File for the line buffer behind the log console element.
+"""
+import threading
+from typing import Callable, Iterable, List, Optional
+
+
+class Log:
+    """
+    A ring buffer of log lines. Lines can be added from any thread.
+
+    ``on_append`` is called after lines were added or removed. The log console connects it to the redraw of its window.
+    """
+
+    max_lines: int
+    count: int
+    filter: str
+    on_append: Optional[Callable] = None
+
+    def __init__(self, max_lines: int = 10000) -> None:
+        self.max_lines = max_lines
+        self.count = 0
+        self.filter = ""
+        self._lines: List[Optional[str]] = [None] * max_lines
+        self._lock = threading.Lock()
+        self._matches: List[int] = []
+        self._matches_start = 0
+        self._indexed = 0
+        self._indexed_filter = ""
+        self._visible_first = 0
+
+    @property
+    def first(self) -> int:
+        """
+        The number of the oldest line that is still in the buffer.
+
+        Returns
+        -------
+        int
+            The line number. Lines are numbered from 0 in the order they were added.
+        """
+        return max(self.count - self.max_lines, 0)
+
+    def append(self, line: str) -> None:
+        """
+        Add a line, removing the oldest line if the buffer is full.
+
+        Parameters
+        ----------
+        line : str
+            The line to add.
+        """
+        with self._lock:
+            self._lines[self.count % self.max_lines] = line
+            self.count += 1
+        if self.on_append is not None:
+            self.on_append()
+
+    def extend(self, lines: Iterable[str]) -> None:
+        """
+        Add several lines at once.
+
+        Parameters
+        ----------
+        lines : Iterable[str]
+            The lines to add.
+        """
+        with self._lock:
+            for line in lines:
+                self._lines[self.count % self.max_lines] = line
+                self.count += 1
+        if self.on_append is not None:
+            self.on_append()
+
+    def write(self, text: str) -> None:
+        """
+        Add text that can contain several lines, so the log can be used like a file.
+
+        Parameters
+        ----------
+        text : str
+            The text to add. Empty lines are skipped.
+        """
+        self.extend(line for line in text.splitlines() if line)
+
+    def clear(self) -> None:
+        """
+        Remove every line.
+        """
+        with self._lock:
+            self._lines = [None] * self.max_lines
+            self.count = 0
+            self._matches = []
+            self._matches_start = 0
+            self._indexed = 0
+            self._visible_first = 0
+        if self.on_append is not None:
+            self.on_append()
+
+    def line(self, number: int) -> str:
+        """
+        Get a line by its number.
+
+        Parameters
+        ----------
+        number : int
+            The number of the line. It should be between ``first`` and ``count``.
+
+        Returns
+        -------
+        str
+            The line.
+        """
+        return self._lines[number % self.max_lines]
+
+    def visible(self) -> int:
+        """
+        Update the filter index with the lines added since the last call.
+
+        Only the new lines are searched, unless the filter changed since the last call.
+
+        Returns
+        -------
+        int
+            How many lines match the filter.
+        """
+        with self._lock:
+            first = self.first
+            self._visible_first = first
+            if self.filter != self._indexed_filter:
+                self._indexed_filter = self.filter
+                self._matches = []
+                self._matches_start = 0
+                self._indexed = first
+            if not self.filter:
+                self._indexed = self.count
+                return self.count - first
+
+            for number in range(max(self._indexed, first), self.count):
+                if self.filter in self._lines[number % self.max_lines]:
+                    self._matches.append(number)
+            self._indexed = self.count
+
+            while (
+                self._matches_start < len(self._matches)
+                and self._matches[self._matches_start] < first
+            ):
+                self._matches_start += 1
+            if self._matches_start > len(self._matches) // 2:
+                del self._matches[: self._matches_start]
+                self._matches_start = 0
+            return len(self._matches) - self._matches_start
+
+    def visible_line(self, index: int) -> str:
+        """
+        Get a line that matches the filter. ``visible`` should be called first.
+
+        Lines are counted from the oldest line when ``visible`` was called, so lines added from another thread in between don't move them.
+
+        Parameters
+        ----------
+        index : int
+            The index of the line, between 0 and the result of ``visible``.
+
+        Returns
+        -------
+        str
+            The line, or an empty string if it was removed since ``visible`` was called.
+        """
+        with self._lock:
+            if not self._indexed_filter:
+                number = self._visible_first + index
+            elif self._matches_start + index < len(self._matches):
+                number = self._matches[self._matches_start + index]
+            else:
+                return ""
+            if not self.first <= number < self.count:
+                return ""
+            return self._lines[number % self.max_lines]
+
+    def __len__(self) -> int:
+        return self.count - self.first
+
+    def __repr__(self) -> str:
+        return f"Log(max_lines={self.max_lines}, lines={len(self)})"
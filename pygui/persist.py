@@ -0,0 +1,186 @@
+"""
+File for saving the state to disk and loading it again.
+"""
+import os
+import threading
+from typing import Any, Optional, Set
+
+from pygui.elements import ClickTime, State
+from pygui.lazy import lazy_import
+
+pickle = lazy_import("pickle")
+
+PERSIST_INTERVAL = 0.5
+COMPACT_AFTER = 1024 * 1024
+
+_SET = 0
+_DELETE = 1
+
+
+class Persistence:
+    """
+    Saves a state as a snapshot and a journal of the changes since it, from a background thread.
+
+    The journal is compacted into a new snapshot once it is ``compact_after`` bytes larger than the snapshot.
+    """
+
+    path: str
+    journal_path: str
+    interval: float
+    compact_after: int
+
+    def __init__(
+        self,
+        path: str,
+        state: State,
+        interval: float = PERSIST_INTERVAL,
+        compact_after: int = COMPACT_AFTER,
+    ) -> None:
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.state = state
+        self.interval = interval
+        self.compact_after = compact_after
+        self._saved: Set[Any] = set()
+        self._saved_version = -1
+        self._retry: Set[Any] = set()
+        self._snapshot_bytes = 0
+        self._journal_bytes = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def restore(self) -> None:
+        """
+        Load the snapshot and replay the journal into the state.
+
+        A record at the end of the journal that was cut off by a crash is removed, so later changes are appended after the last complete one.
+        """
+        values = {}
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as file:
+                values = pickle.load(file)
+            self._snapshot_bytes = os.path.getsize(self.path)
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "rb") as file:
+                end = 0
+                while True:
+                    try:
+                        record = pickle.load(file)
+                    except Exception:  # pylint: disable=broad-except
+                        # The end of the file. A record cut off by a crash fails in different ways depending on where it was cut.
+                        break
+                    if record[0] == _SET:
+                        values[record[1]] = record[2]
+                    else:
+                        values.pop(record[1], None)
+                    end = file.tell()
+            if end < os.path.getsize(self.journal_path):
+                os.truncate(self.journal_path, end)
+            self._journal_bytes = end
+        self._saved = set(values)
+        self.state.update(values)
+        self._saved_version = self.state.version
+        self.state.track_changes()
+
+    def start(self) -> None:
+        """
+        Start saving the changes in the background.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pygui-persist", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background thread and save the last changes.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Append the values of the keys that were set or deleted since the last flush to the journal.
+
+        Values that cannot be pickled and button click times are skipped. Values changed in place have to be set again to be saved.
+        """
+        with self._lock:
+            version = self.state.version
+            if version == self._saved_version and not self._retry:
+                return
+            self.state.track_changes()
+            modified = dict.copy(self.state.modified)
+            keys = [key for key, changed_at in modified.items() if changed_at > self._saved_version]
+            keys.extend(self._retry.difference(keys))
+            self._retry.clear()
+
+            records = []
+            for key in keys:
+                if key not in self.state:
+                    if key in self._saved:
+                        self._saved.discard(key)
+                        records.append(pickle.dumps((_DELETE, key), pickle.HIGHEST_PROTOCOL))
+                    continue
+                value = dict.get(self.state, key)
+                if isinstance(value, ClickTime):
+                    continue
+                try:
+                    records.append(pickle.dumps((_SET, key, value), pickle.HIGHEST_PROTOCOL))
+                except (pickle.PicklingError, TypeError, AttributeError):
+                    continue
+                except RuntimeError:
+                    # The value was changed by the UI thread while it was pickled.
+                    self._retry.add(key)
+                    continue
+                self._saved.add(key)
+
+            if records:
+                data = b"".join(records)
+                with open(self.journal_path, "ab") as file:
+                    file.write(data)
+                self._journal_bytes += len(data)
+            self._saved_version = version
+
+            if self._journal_bytes > self._snapshot_bytes + self.compact_after:
+                self._compact()
+
+    def _compact(self) -> None:
+        """
+        Write every saved value to a new snapshot and empty the journal.
+
+        If a value is changed while it is pickled, the journal is kept and compacting is tried again on the next flush.
+        """
+        values = {}
+        for key in self._saved:
+            if key not in self.state:
+                continue
+            value = dict.get(self.state, key)
+            try:
+                pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                continue
+            except RuntimeError:
+                return
+            values[key] = value
+        try:
+            data = pickle.dumps(values, pickle.HIGHEST_PROTOCOL)
+        except RuntimeError:
+            return
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(data)
+        os.replace(temporary_path, self.path)
+        with open(self.journal_path, "wb"):
+            pass
+        self._snapshot_bytes = len(data)
+        self._journal_bytes = 0
+
+    def __repr__(self) -> str:
+        return f"Persistence(path={self.path!r})"
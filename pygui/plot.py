@@ -0,0 +1,85 @@
+"""
+File for turning data into the float32 buffers imgui plots.
+"""
+import sys
+from array import array
+from typing import Any, Tuple
+
+
+def as_floats(data: Any) -> Any:
+    """
+    Get the data as a buffer of float32 values, copying it only if it has another type.
+
+    Parameters
+    ----------
+    data : Any
+        A NumPy array, an ``array.array``, any other buffer or a sequence of numbers.
+
+    Returns
+    -------
+    Any
+        A 1 dimensional, contiguous float32 buffer.
+    """
+    try:
+        view = memoryview(data)
+    except TypeError:
+        return array("f", data)
+    if view.format == "f" and view.ndim == 1 and view.c_contiguous:
+        return view
+    numpy = sys.modules.get("numpy")
+    if numpy is not None:
+        return numpy.ascontiguousarray(numpy.asarray(data).ravel(), dtype=numpy.float32)
+    return array("f", view.cast("B").cast(view.format) if view.ndim != 1 else view)
+
+
+def downsample(data: Any, buckets: int) -> Tuple[Any, float, float]:
+    """
+    Shrink the data to the minimum and maximum of every bucket, so peaks stay visible.
+
+    Parameters
+    ----------
+    data : Any
+        A NumPy array, an ``array.array``, any other buffer or a sequence of numbers.
+    buckets : int
+        How many buckets to split the data into, usually the width of the plot in pixels.
+
+    Returns
+    -------
+    Tuple[Any, float, float]
+        The float32 values to plot, the minimum and the maximum of the data.
+        The values are None if the data is a short float32 buffer, which can be plotted as it is.
+    """
+    values = as_floats(data)
+    count = len(values)
+    if count == 0:
+        return array("f"), 0.0, 0.0
+    numpy = sys.modules.get("numpy")
+    if count <= buckets * 2:
+        if numpy is not None:
+            values_array = numpy.asarray(values)
+            minimum, maximum = float(values_array.min()), float(values_array.max())
+            del values_array
+        else:
+            minimum, maximum = min(values), max(values)
+        if isinstance(values, memoryview):
+            # Keeping the view would stop the data from growing, like an array.array that samples are appended to.
+            values.release()
+            return None, minimum, maximum
+        return values, minimum, maximum
+
+    if numpy is not None:
+        values_array = numpy.asarray(values)
+        edges = numpy.linspace(0, count, buckets + 1).astype(numpy.intp)[:-1]
+        result = numpy.empty(buckets * 2, dtype=numpy.float32)
+        result[0::2] = numpy.minimum.reduceat(values_array, edges)
+        result[1::2] = numpy.maximum.reduceat(values_array, edges)
+        return result, float(result[0::2].min()), float(result[1::2].max())
+
+    result = array("f", bytes(4 * buckets * 2))
+    for bucket in range(buckets):
+        chunk = values[count * bucket // buckets : count * (bucket + 1) // buckets]
+        result[bucket * 2] = min(chunk)
+        result[bucket * 2 + 1] = max(chunk)
+    if isinstance(values, memoryview):
+        values.release()
+    return result, min(result[0::2]), max(result[1::2])
@@ -0,0 +1,222 @@
+"""
+File for drawing imgui's draw data with OpenGL.
+"""
+import functools
+from typing import TYPE_CHECKING, Literal, Type
+
+from pygui.lazy import lazy_import
+
+if TYPE_CHECKING:
+    from imgui.integrations.glfw import GlfwRenderer
+
+ctypes = lazy_import("ctypes")
+gl = lazy_import("OpenGL.GL")
+imgui = lazy_import("imgui")
+
+RendererName = Type[Literal["batched", "imgui"]]
+
+
+@functools.lru_cache(maxsize=None)
+def renderer_class(name: RendererName = "imgui") -> Type["GlfwRenderer"]:
+    """
+    Create the renderer class. It is created on first use, so imgui's integrations are only imported when a window opens.
+
+    Parameters
+    ----------
+    name : RendererName, optional
+        ``"batched"`` for the renderer of pygui or ``"imgui"`` for the one that comes with imgui, by default "imgui"
+
+    Returns
+    -------
+    Type[GlfwRenderer]
+        A GlfwRenderer that can share its font texture with the renderers of other windows.
+
+    Raises
+    ------
+    ValueError
+        If the name is not a known renderer.
+    """
+    from imgui.integrations.glfw import GlfwRenderer  # pylint: disable=import-outside-toplevel
+
+    class Renderer(GlfwRenderer):
+        """
+        A GlfwRenderer that only uploads the font texture if it owns it.
+
+        The other renderers draw with the texture of the shared font atlas.
+        """
+
+        def __init__(self, window, owns_font_texture: bool = True):
+            self.owns_font_texture = owns_font_texture
+            super().__init__(window)
+
+        def refresh_font_texture(self):
+            if self.owns_font_texture:
+                super().refresh_font_texture()
+            else:
+                self._font_texture = self.io.fonts.texture_id
+
+        def char_callback(self, window, char):
+            # GlfwRenderer uses the current context, which is not this one when several windows are open.
+            if 0 < char < 0x10000:
+                self.io.add_input_character(char)
+
+        def shutdown(self):
+            if self.owns_font_texture:
+                super().shutdown()
+                return
+            texture_id = self.io.fonts.texture_id
+            self._font_texture = -1
+            super().shutdown()
+            self.io.fonts.texture_id = texture_id
+
+    if name == "imgui":
+        return Renderer
+    if name != "batched":
+        raise ValueError(f"Unknown renderer {name!r}")
+
+    class DrawCommand(ctypes.Structure):
+        """
+        The layout of ``ImDrawCmd`` in the Dear ImGui version pyimgui 1.4 is built with.
+
+        Reading the command buffer through this avoids creating a Python object for every command.
+        The texture id is the address of the Python object that was passed to imgui.
+        """
+
+        _fields_ = [
+            ("elem_count", ctypes.c_uint),
+            ("clip_rect", ctypes.c_float * 4),
+            ("texture_id", ctypes.c_void_p),
+            ("user_callback", ctypes.c_void_p),
+            ("user_callback_data", ctypes.c_void_p),
+        ]
+
+    class BatchedRenderer(Renderer):
+        """
+        Uploads the vertices and indices of all draw lists at once and skips state changes that change nothing.
+
+        pygui owns the OpenGL context, so the state is set every frame instead of being saved and restored.
+        The scissor test is turned off again at the end, so clearing the next frame is not clipped.
+        """
+
+        def __init__(self, window, owns_font_texture: bool = True):
+            self._vertex_capacity = 0
+            self._index_capacity = 0
+            super().__init__(window, owns_font_texture)
+
+        def _upload(self, target, handle: int, capacity: int, chunks) -> int:
+            """
+            Copy the buffers of every draw list into one OpenGL buffer with a single mapping.
+
+            The buffer is orphaned first, so the driver never waits for the previous frame to finish with it.
+
+            Returns
+            -------
+            int
+                The new capacity of the buffer in bytes.
+            """
+            size = sum(length for _, length in chunks)
+            gl.glBindBuffer(target, handle)
+            if size > capacity:
+                capacity = max(size, capacity * 2)
+            gl.glBufferData(target, capacity, None, gl.GL_STREAM_DRAW)
+            address = gl.glMapBufferRange(
+                target, 0, size, gl.GL_MAP_WRITE_BIT | gl.GL_MAP_INVALIDATE_BUFFER_BIT
+            )
+            offset = 0
+            for data, length in chunks:
+                ctypes.memmove(address + offset, data, length)
+                offset += length
+            gl.glUnmapBuffer(target)
+            return capacity
+
+        def render(self, draw_data):
+            io = self.io
+            display_width, display_height = io.display_size
+            fb_width = int(display_width * io.display_fb_scale[0])
+            fb_height = int(display_height * io.display_fb_scale[1])
+            if fb_width == 0 or fb_height == 0 or draw_data.total_vtx_count == 0:
+                return
+            draw_data.scale_clip_rects(*io.display_fb_scale)
+            lists = draw_data.commands_lists
+
+            gl.glEnable(gl.GL_BLEND)
+            gl.glBlendEquation(gl.GL_FUNC_ADD)
+            gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+            gl.glDisable(gl.GL_CULL_FACE)
+            gl.glDisable(gl.GL_DEPTH_TEST)
+            gl.glEnable(gl.GL_SCISSOR_TEST)
+            gl.glActiveTexture(gl.GL_TEXTURE0)
+            gl.glViewport(0, 0, fb_width, fb_height)
+
+            projection = (ctypes.c_float * 16)(
+                2.0 / display_width, 0.0, 0.0, 0.0,
+                0.0, -2.0 / display_height, 0.0, 0.0,
+                0.0, 0.0, -1.0, 0.0,
+                -1.0, 1.0, 0.0, 1.0,
+            )  # fmt: skip
+            gl.glUseProgram(self._shader_handle)
+            gl.glUniform1i(self._attrib_location_tex, 0)
+            gl.glUniformMatrix4fv(self._attrib_proj_mtx, 1, gl.GL_FALSE, projection)
+            gl.glBindVertexArray(self._vao_handle)
+
+            self._vertex_capacity = self._upload(
+                gl.GL_ARRAY_BUFFER,
+                self._vbo_handle,
+                self._vertex_capacity,
+                [
+                    (commands.vtx_buffer_data, commands.vtx_buffer_size * imgui.VERTEX_SIZE)
+                    for commands in lists
+                ],
+            )
+            self._index_capacity = self._upload(
+                gl.GL_ELEMENT_ARRAY_BUFFER,
+                self._elements_handle,
+                self._index_capacity,
+                [
+                    (commands.idx_buffer_data, commands.idx_buffer_size * imgui.INDEX_SIZE)
+                    for commands in lists
+                ],
+            )
+
+            # Following commands with the same texture and clip rectangle are drawn as one batch.
+            batches = []
+            vertex_base = 0
+            index_base = 0
+            for commands in lists:
+                list_start = index_base
+                batch_key = None
+                batch_start = index_base
+                for command in (DrawCommand * commands.cmd_buffer_size).from_address(
+                    commands.cmd_buffer_data
+                ):
+                    key = (command.texture_id, tuple(command.clip_rect))
+                    if key != batch_key and index_base > batch_start:
+                        batches.append((batch_key, batch_start, index_base - batch_start, vertex_base))
+                        batch_start = index_base
+                    batch_key = key
+                    index_base += command.elem_count
+                if index_base > batch_start:
+                    batches.append((batch_key, batch_start, index_base - batch_start, vertex_base))
+                vertex_base += commands.vtx_buffer_size
+                index_base = list_start + commands.idx_buffer_size
+
+            index_type = gl.GL_UNSIGNED_SHORT if imgui.INDEX_SIZE == 2 else gl.GL_UNSIGNED_INT
+            bound_texture = None
+            scissor = None
+            for (texture_id, (x, y, z, w)), start, count, base in batches:
+                if texture_id != bound_texture:
+                    # pyimgui stores the texture id as a pointer to the Python object it was given.
+                    gl.glBindTexture(
+                        gl.GL_TEXTURE_2D, ctypes.cast(texture_id, ctypes.py_object).value if texture_id else 0
+                    )
+                    bound_texture = texture_id
+                new_scissor = (int(x), int(fb_height - w), int(z - x), int(w - y))
+                if new_scissor != scissor:
+                    gl.glScissor(*new_scissor)
+                    scissor = new_scissor
+                gl.glDrawElementsBaseVertex(
+                    gl.GL_TRIANGLES, count, index_type, ctypes.c_void_p(start * imgui.INDEX_SIZE), base
+                )
+            gl.glDisable(gl.GL_SCISSOR_TEST)
+
+    return BatchedRenderer
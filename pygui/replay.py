@@ -0,0 +1,216 @@
+"""
+File for recording the input of a window and playing it back.
+"""
+import struct
+from typing import BinaryIO, Iterator, List, NamedTuple, Tuple
+
+MAGIC = b"PYGUIIN1"
+FRAME = struct.Struct("<dffffBffBHH")
+KEY_EVENT = struct.Struct("<HBB")
+CHARACTER = struct.Struct("<I")
+MOUSE_BUTTONS = 3
+
+CTRL = 1
+ALT = 2
+SHIFT = 4
+SUPER = 8
+
+
+class RecordedFrame(NamedTuple):
+    """
+    The input imgui got for one frame.
+    """
+
+    delta_time: float
+    display_size: Tuple[float, float]
+    mouse_position: Tuple[float, float]
+    mouse_down: int
+    mouse_wheel: float
+    mouse_wheel_horizontal: float
+    modifiers: int
+    keys: Tuple[Tuple[int, bool, int], ...]
+    text: str
+
+
+class InputRecorder:
+    """
+    Writes the input of every frame to a file.
+
+    Key events and characters are collected from the GLFW callbacks, the rest is read from imgui after the inputs were processed.
+    """
+
+    path: str
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file: BinaryIO = open(path, "wb")  # pylint: disable=consider-using-with
+        self._file.write(MAGIC)
+        self._keys: List[Tuple[int, bool, int]] = []
+        self._text: List[int] = []
+
+    def key(self, key: int, down: bool, mods: int) -> None:
+        """
+        Record a key being pressed or released.
+
+        Parameters
+        ----------
+        key : int
+            The GLFW keycode.
+        down : bool
+            If the key was pressed.
+        mods : int
+            The GLFW modifier bits.
+        """
+        if 0 <= key < 512:
+            self._keys.append((key, down, mods))
+
+    def char(self, char: int) -> None:
+        """
+        Record a typed character.
+
+        Parameters
+        ----------
+        char : int
+            The unicode code point.
+        """
+        self._text.append(char)
+
+    def frame(self, io) -> None:
+        """
+        Write the input of a frame.
+
+        Parameters
+        ----------
+        io : imgui.core._IO
+            The imgui IO object, after the inputs of the frame were processed.
+        """
+        mouse_down = 0
+        for button in range(MOUSE_BUTTONS):
+            if io.mouse_down[button]:
+                mouse_down |= 1 << button
+        modifiers = (
+            CTRL * io.key_ctrl | ALT * io.key_alt | SHIFT * io.key_shift | SUPER * io.key_super
+        )
+        self._file.write(
+            FRAME.pack(
+                io.delta_time,
+                *io.display_size,
+                *io.mouse_pos,
+                mouse_down,
+                io.mouse_wheel,
+                io.mouse_wheel_horizontal,
+                modifiers,
+                len(self._keys),
+                len(self._text),
+            )
+        )
+        for key, down, mods in self._keys:
+            self._file.write(KEY_EVENT.pack(key, down, mods))
+        for char in self._text:
+            self._file.write(CHARACTER.pack(char))
+        self._keys.clear()
+        self._text.clear()
+
+    def close(self) -> None:
+        """
+        Close the file.
+        """
+        self._file.close()
+
+    def __repr__(self) -> str:
+        return f"InputRecorder(path={self.path!r})"
+
+
+def read_recording(path: str) -> Iterator[RecordedFrame]:
+    """
+    Read the frames of a recording.
+
+    Parameters
+    ----------
+    path : str
+        The path of the recording.
+
+    Yields
+    ------
+    RecordedFrame
+        The input of every frame.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a recording.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path!r} is not an input recording")
+
+    offset = len(MAGIC)
+    while offset + FRAME.size <= len(data):
+        (
+            delta_time,
+            width,
+            height,
+            mouse_x,
+            mouse_y,
+            mouse_down,
+            mouse_wheel,
+            mouse_wheel_horizontal,
+            modifiers,
+            key_count,
+            text_length,
+        ) = FRAME.unpack_from(data, offset)
+        offset += FRAME.size
+        keys = tuple(
+            (key, bool(down), mods)
+            for key, down, mods in KEY_EVENT.iter_unpack(
+                data[offset : offset + key_count * KEY_EVENT.size]
+            )
+        )
+        offset += key_count * KEY_EVENT.size
+        text = "".join(
+            chr(char)
+            for (char,) in CHARACTER.iter_unpack(
+                data[offset : offset + text_length * CHARACTER.size]
+            )
+        )
+        offset += text_length * CHARACTER.size
+        yield RecordedFrame(
+            delta_time,
+            (width, height),
+            (mouse_x, mouse_y),
+            mouse_down,
+            mouse_wheel,
+            mouse_wheel_horizontal,
+            modifiers,
+            keys,
+            text,
+        )
+
+
+def apply_frame(io, recorded: RecordedFrame) -> None:
+    """
+    Give the input of a recorded frame to imgui.
+
+    Parameters
+    ----------
+    io : imgui.core._IO
+        The imgui IO object.
+    recorded : RecordedFrame
+        The recorded input.
+    """
+    io.delta_time = recorded.delta_time
+    io.display_size = recorded.display_size
+    io.mouse_pos = recorded.mouse_position
+    for button in range(MOUSE_BUTTONS):
+        io.mouse_down[button] = bool(recorded.mouse_down & 1 << button)
+    io.mouse_wheel = recorded.mouse_wheel
+    io.mouse_wheel_horizontal = recorded.mouse_wheel_horizontal
+    io.key_ctrl = bool(recorded.modifiers & CTRL)
+    io.key_alt = bool(recorded.modifiers & ALT)
+    io.key_shift = bool(recorded.modifiers & SHIFT)
+    io.key_super = bool(recorded.modifiers & SUPER)
+    for key, down, _ in recorded.keys:
+        io.keys_down[key] = down
+    for character in recorded.text:
+        io.add_input_character(ord(character))
@@ -0,0 +1,135 @@
+"""
+File for timing the stages of the render loop.
+"""
+import math
+from array import array
+from typing import Dict, Iterator, Tuple
+
+STATS_SIZE = 240
+
+
+class Timings:
+    """
+    The last timings of one stage, kept in a fixed-size ring buffer.
+    """
+
+    __slots__ = ("samples", "index", "count")
+
+    samples: array
+    index: int
+    count: int
+
+    def __init__(self, size: int = STATS_SIZE) -> None:
+        self.samples = array("d", bytes(8 * size))
+        self.index = 0
+        self.count = 0
+
+    def add(self, seconds: float) -> None:
+        """
+        Add a timing, replacing the oldest one when the buffer is full.
+
+        Parameters
+        ----------
+        seconds : float
+            How long the stage took.
+        """
+        self.samples[self.index] = seconds
+        self.index = (self.index + 1) % len(self.samples)
+        self.count = min(self.count + 1, len(self.samples))
+
+    def percentile(self, percent: float) -> float:
+        """
+        Get a percentile of the stored timings.
+
+        Parameters
+        ----------
+        percent : float
+            The percentile, between 0 and 100.
+
+        Returns
+        -------
+        float
+            The timing in seconds, or 0 if there are no timings yet.
+        """
+        return self.percentiles(percent)[0]
+
+    def percentiles(self, *percents: float) -> Tuple[float, ...]:
+        """
+        Get several percentiles of the stored timings, sorting them only once.
+
+        Parameters
+        ----------
+        *percents : float
+            The percentiles, between 0 and 100. By default 50, 95 and 99.
+
+        Returns
+        -------
+        Tuple[float, ...]
+            The timings in seconds, or zeros if there are no timings yet.
+        """
+        percents = percents or (50, 95, 99)
+        if self.count == 0:
+            return tuple(0.0 for _ in percents)
+        ordered = sorted(self.samples[: self.count])
+        return tuple(
+            ordered[max(math.ceil(percent / 100 * self.count) - 1, 0)]
+            for percent in percents
+        )
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class Stats:
+    """
+    Timings for every stage of the render loop.
+    """
+
+    size: int
+    stages: Dict[str, Timings]
+
+    def __init__(self, size: int = STATS_SIZE) -> None:
+        self.size = size
+        self.stages = {}
+
+    def record(self, stage: str, seconds: float) -> None:
+        """
+        Record how long a stage took.
+
+        Parameters
+        ----------
+        stage : str
+            The name of the stage.
+        seconds : float
+            How long the stage took.
+        """
+        timings = self.stages.get(stage)
+        if timings is None:
+            timings = self.stages[stage] = Timings(self.size)
+        timings.add(seconds)
+
+    def summary(self) -> Dict[str, Tuple[float, ...]]:
+        """
+        Get the p50, p95 and p99 of every stage.
+
+        Returns
+        -------
+        Dict[str, Tuple[float, ...]]
+            The percentiles in seconds for every stage.
+        """
+        return {stage: timings.percentiles() for stage, timings in self.stages.items()}
+
+    def clear(self) -> None:
+        """
+        Remove every timing.
+        """
+        self.stages.clear()
+
+    def __getitem__(self, stage: str) -> Timings:
+        return self.stages[stage]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.stages)
+
+    def __repr__(self) -> str:
+        return f"Stats(stages={list(self.stages)!r})"
@@ -0,0 +1,234 @@
+"""
+File for running functions and coroutines in the background and handing their results back to the window.
+"""
+import collections
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Coroutine,
+    Deque,
+    Dict,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+if TYPE_CHECKING:
+    import asyncio
+    import concurrent.futures
+
+
+class Task(NamedTuple):
+    """
+    A function running in the background.
+    """
+
+    future: Union["concurrent.futures.Future", "asyncio.Future"]
+    callback: Optional[Callable]
+    error_callback: Optional[Callable]
+    key: Optional[str]
+
+
+class Tasks:
+    """
+    Runs functions on a thread or process pool. Their results are delivered on the UI thread.
+    """
+
+    max_workers: Optional[int]
+    running: Dict[str, Task]
+
+    def __init__(
+        self, max_workers: Optional[int] = None, on_done: Optional[Callable] = None
+    ) -> None:
+        self.max_workers = max_workers
+        self.on_done = on_done
+        self.running = {}
+        self._threads: Optional["concurrent.futures.ThreadPoolExecutor"] = None
+        self._processes: Optional["concurrent.futures.ProcessPoolExecutor"] = None
+        self._done: Deque[Task] = collections.deque()
+
+    def submit(
+        self,
+        func: Callable,
+        *args,
+        callback: Optional[Callable] = None,
+        error_callback: Optional[Callable] = None,
+        key: Optional[str] = None,
+        process: bool = False,
+        **kwargs,
+    ) -> "concurrent.futures.Future":
+        """
+        Run a function in the background.
+
+        Parameters
+        ----------
+        func : Callable
+            The function to run.
+        *args
+            The arguments to pass to the function.
+        callback : Callable, optional
+            Called on the UI thread with the result of the function, by default None
+        error_callback : Callable, optional
+            Called on the UI thread with the exception raised by the function. If this is None the exception is raised on the UI thread, by default None
+        key : str, optional
+            A key to find the task with, for example for a progress element, by default None
+        process : bool, optional
+            Run the function in a process instead of a thread. The function and arguments have to be picklable, by default False
+        **kwargs
+            The keyword arguments to pass to the function.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            The future of the function.
+        """
+        # concurrent.futures imports logging, which is slow, so it is only imported when a function is submitted.
+        import concurrent.futures  # pylint: disable=import-outside-toplevel
+
+        if process:
+            if self._processes is None:
+                self._processes = concurrent.futures.ProcessPoolExecutor(self.max_workers)
+            executor = self._processes
+        else:
+            if self._threads is None:
+                self._threads = concurrent.futures.ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="pygui"
+                )
+            executor = self._threads
+
+        future = executor.submit(func, *args, **kwargs)
+        self._track(future, callback, error_callback, key)
+        return future
+
+    def schedule(
+        self,
+        coroutine: Coroutine,
+        callback: Optional[Callable] = None,
+        error_callback: Optional[Callable] = None,
+        key: Optional[str] = None,
+    ) -> "asyncio.Task":
+        """
+        Run a coroutine on the running asyncio event loop.
+
+        Parameters
+        ----------
+        coroutine : Coroutine
+            The coroutine to run.
+        callback : Callable, optional
+            Called on the UI thread with the result of the coroutine, by default None
+        error_callback : Callable, optional
+            Called on the UI thread with the exception raised by the coroutine. If this is None the exception is raised on the UI thread, by default None
+        key : str, optional
+            A key to find the task with, for example for a progress element, by default None
+
+        Returns
+        -------
+        asyncio.Task
+            The task running the coroutine.
+
+        Raises
+        ------
+        RuntimeError
+            If there is no running event loop.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._track(task, callback, error_callback, key)
+        return task
+
+    def _track(
+        self,
+        future: Union["concurrent.futures.Future", "asyncio.Future"],
+        callback: Optional[Callable],
+        error_callback: Optional[Callable],
+        key: Optional[str],
+    ) -> None:
+        task = Task(future=future, callback=callback, error_callback=error_callback, key=key)
+        if key is not None:
+            self.running[key] = task
+        future.add_done_callback(lambda _: self._finish(task))
+
+    def _finish(self, task: Task) -> None:
+        # This runs on the worker's thread, so the task is only queued here.
+        self._done.append(task)
+        if self.on_done is not None:
+            self.on_done()
+
+    def is_running(self, key: str) -> bool:
+        """
+        Check if the task with the key is running or its result has not been delivered yet.
+
+        Parameters
+        ----------
+        key : str
+            The key of the task.
+
+        Returns
+        -------
+        bool
+            If the task is still running.
+        """
+        return key in self.running
+
+    def cancel(self, key: str) -> bool:
+        """
+        Cancel the task with the key. A task that already started keeps running, but its result is thrown away.
+
+        Parameters
+        ----------
+        key : str
+            The key of the task.
+
+        Returns
+        -------
+        bool
+            If there was a task to cancel.
+        """
+        task = self.running.pop(key, None)
+        if task is None:
+            return False
+        task.future.cancel()
+        return True
+
+    def process_done(self) -> None:
+        """
+        Call the callbacks of the finished tasks. This should be called on the UI thread.
+
+        Raises
+        ------
+        Exception
+            The exception of a task that failed without an ``error_callback``.
+        """
+        while self._done:
+            task = self._done.popleft()
+            if task.key is not None:
+                if self.running.get(task.key) is not task:
+                    continue  # The task was cancelled or replaced.
+                del self.running[task.key]
+            if task.future.cancelled():
+                continue
+            error = task.future.exception()
+            if error is not None:
+                if task.error_callback is None:
+                    raise error
+                task.error_callback(error)
+            elif task.callback is not None:
+                task.callback(task.future.result())
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Stop the pools. They are created again when another task is submitted.
+
+        Parameters
+        ----------
+        wait : bool, optional
+            Wait for the running tasks to finish, by default False
+        """
+        for executor in (self._threads, self._processes):
+            if executor is not None:
+                executor.shutdown(wait=wait)
+        self._threads = self._processes = None
+
+    def __repr__(self) -> str:
+        return f"Tasks(running={list(self.running)!r})"
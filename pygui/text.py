@@ -0,0 +1,106 @@
+"""
+File for measuring text and splitting it into wrapped lines.
+"""
+import collections
+from typing import Any, NamedTuple, Tuple
+
+from pygui.lazy import lazy_import
+
+imgui = lazy_import("imgui")
+
+TEXT_CACHE_SIZE = 1024
+
+
+class TextLayout(NamedTuple):
+    """
+    The size of a text and the lines it was wrapped into.
+    """
+
+    width: float
+    lines: Tuple[Tuple[str, float], ...]
+
+
+def layout_text(text: str, wrap_width: float) -> TextLayout:
+    """
+    Measure a text with the current font, wrapping it at spaces to fit the width.
+
+    Parameters
+    ----------
+    text : str
+        The text to measure.
+    wrap_width : float
+        The width to wrap the text at. 0 doesn't wrap it.
+
+    Returns
+    -------
+    TextLayout
+        The width of the widest line and the lines with their widths.
+    """
+    lines = []
+    for paragraph in text.split("\n"):
+        if wrap_width <= 0:
+            lines.append((paragraph, imgui.calc_text_size(paragraph).x))
+            continue
+        words = paragraph.split(" ")
+        line = words[0]
+        line_width = imgui.calc_text_size(line).x
+        for word in words[1:]:
+            candidate = f"{line} {word}"
+            candidate_width = imgui.calc_text_size(candidate).x
+            if candidate_width <= wrap_width:
+                line, line_width = candidate, candidate_width
+            else:
+                # Words that are wider than the wrap width get a line of their own.
+                lines.append((line, line_width))
+                line, line_width = word, imgui.calc_text_size(word).x
+        lines.append((line, line_width))
+    return TextLayout(max(width for _, width in lines), tuple(lines))
+
+
+class TextCache:
+    """
+    A least recently used cache of text layouts, keyed by the text, the font, the font size and the wrap width.
+
+    The font size includes the window font scale and the global font scale, so a change of either one uses new entries.
+    """
+
+    def __init__(self, size: int = TEXT_CACHE_SIZE) -> None:
+        self.size = size
+        self._layouts: "collections.OrderedDict[tuple, TextLayout]" = collections.OrderedDict()
+
+    def get(self, text: str, font: Any = None, wrap_width: float = 0) -> TextLayout:
+        """
+        Get the layout of a text with the current font, measuring it if it is not cached.
+
+        Parameters
+        ----------
+        text : str
+            The text to measure.
+        font : Any, optional
+            The pushed font, None for the default font, by default None
+        wrap_width : float, optional
+            The width to wrap the text at. 0 doesn't wrap it, by default 0
+
+        Returns
+        -------
+        TextLayout
+            The layout of the text.
+        """
+        key = (text, id(font), imgui.get_font_size(), round(wrap_width))
+        layout = self._layouts.get(key)
+        if layout is not None:
+            self._layouts.move_to_end(key)
+            return layout
+        layout = self._layouts[key] = layout_text(text, round(wrap_width))
+        if len(self._layouts) > self.size:
+            self._layouts.popitem(last=False)
+        return layout
+
+    def clear(self) -> None:
+        """
+        Remove every layout. The window calls this when the fonts are loaded again.
+        """
+        self._layouts.clear()
+
+    def __len__(self) -> int:
+        return len(self._layouts)
@@ -0,0 +1,98 @@
+"""
+File for running frame functions less often than the window renders.
+"""
+from typing import Any, Callable, List, Tuple
+
+from pygui.elements import Elements
+from pygui.lazy import lazy_import
+
+imgui = lazy_import("imgui")
+
+
+class Recorder:
+    """
+    Passes calls through to the elements, recording them so they can be replayed.
+    """
+
+    __slots__ = ("elements", "calls")
+
+    elements: Elements
+    calls: List[Tuple[Callable, tuple, dict]]
+
+    def __init__(self, elements: Elements) -> None:
+        self.elements = elements
+        self.calls = []
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.elements, name)
+        if not callable(attribute):
+            return attribute
+
+        def record(*args, **kwargs):
+            self.calls.append((attribute, args, kwargs))
+            return attribute(*args, **kwargs)
+
+        return record
+
+
+class Throttle:
+    """
+    Runs a frame function at most ``max_hz`` times a second and replays its elements in between.
+    """
+
+    __slots__ = ("max_hz", "next_update", "recorder")
+
+    max_hz: float
+    next_update: float
+    recorder: Recorder
+
+    def __init__(self, max_hz: float, elements: Elements) -> None:
+        self.max_hz = max_hz
+        self.next_update = 0.0
+        self.recorder = Recorder(elements)
+
+    def reset(self) -> None:
+        """
+        Forget the last update, so the frame function runs on the next frame. A new imgui context starts its clock at 0 again.
+        """
+        self.next_update = 0.0
+        self.recorder.calls.clear()
+        self.recorder.elements.clicks.clear()
+
+    def run(self, func: Callable) -> Any:
+        """
+        Run the frame function if it is time for an update, otherwise replay the last update.
+
+        Parameters
+        ----------
+        func : Callable
+            The frame function.
+
+        Returns
+        -------
+        Any
+            What the frame function returned, or None if the last update was replayed.
+        """
+        # imgui's time advances by the frame's delta time, so headless runs and replays throttle the same way every time.
+        now = imgui.get_time()
+        elements = self.recorder.elements
+        if now >= self.next_update:
+            self.next_update = now + 1 / self.max_hz
+            self.recorder.calls.clear()
+            result = func(self.recorder)
+            elements.clicks.clear()
+            return result
+
+        elements.replaying = True
+        try:
+            for method, args, kwargs in self.recorder.calls:
+                method(*args, **kwargs)
+        finally:
+            elements.replaying = False
+        if elements.clicks:
+            # The click handlers are in the frame function, so it runs on the next frame.
+            self.next_update = 0.0
+            elements.next_redraw = now
+        else:
+            elements.next_redraw = min(elements.next_redraw, self.next_update)
+        return None
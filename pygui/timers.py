@@ -0,0 +1,154 @@
+"""
+File for calling functions after a delay or at an interval from the render loop.
+"""
+import heapq
+import itertools
+import math
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+class Timer:
+    """
+    A scheduled function call. It can be cancelled until it runs.
+    """
+
+    __slots__ = ("deadline", "interval", "func", "args", "cancelled")
+
+    def __init__(
+        self, deadline: float, interval: Optional[float], func: Callable, args: tuple
+    ) -> None:
+        self.deadline = deadline
+        self.interval = interval
+        self.func = func
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """
+        Stop the timer. A cancelled timer is removed from the heap the next time it reaches the top.
+        """
+        self.cancelled = True
+
+    def __repr__(self) -> str:
+        return f"Timer(func={self.func!r}, deadline={self.deadline}, interval={self.interval})"
+
+
+class Timers:
+    """
+    A min-heap of timers ordered by their deadline. Due timers are called on the UI thread.
+    """
+
+    def __init__(self, on_add: Optional[Callable] = None) -> None:
+        self.on_add = on_add
+        self._heap: List[Tuple[float, int, Timer]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def after(self, delay: float, func: Callable, *args) -> Timer:
+        """
+        Call a function once after a delay.
+
+        Parameters
+        ----------
+        delay : float
+            How many seconds to wait before calling the function.
+        func : Callable
+            The function to call.
+        *args
+            The arguments to call the function with.
+
+        Returns
+        -------
+        Timer
+            The timer, which can be cancelled.
+        """
+        return self._push(Timer(time.monotonic() + delay, None, func, args))
+
+    def every(self, interval: float, func: Callable, *args) -> Timer:
+        """
+        Call a function repeatedly, the first time after one interval.
+
+        Parameters
+        ----------
+        interval : float
+            How many seconds to wait between the calls.
+        func : Callable
+            The function to call.
+        *args
+            The arguments to call the function with.
+
+        Returns
+        -------
+        Timer
+            The timer, which can be cancelled.
+
+        Raises
+        ------
+        ValueError
+            If the interval is not positive.
+        """
+        if interval <= 0:
+            raise ValueError("The interval of a timer has to be positive")
+        return self._push(Timer(time.monotonic() + interval, interval, func, args))
+
+    def _push(self, timer: Timer) -> Timer:
+        with self._lock:
+            heapq.heappush(self._heap, (timer.deadline, next(self._counter), timer))
+        if self.on_add is not None:
+            self.on_add()
+        return timer
+
+    def run_due(self) -> None:
+        """
+        Call the timers whose deadline has passed. Repeating timers are scheduled again.
+
+        Raises
+        ------
+        Exception
+            Any exception raised by a timer's function.
+        """
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._heap or self._heap[0][0] > now:
+                    return
+                _, _, timer = heapq.heappop(self._heap)
+                if timer.cancelled:
+                    continue
+                if timer.interval is not None:
+                    # Missed calls are skipped instead of being run all at once.
+                    timer.deadline += timer.interval
+                    if timer.deadline <= now:
+                        timer.deadline = now + timer.interval
+                    heapq.heappush(self._heap, (timer.deadline, next(self._counter), timer))
+            timer.func(*timer.args)
+
+    def timeout(self) -> float:
+        """
+        Get how long the render loop can sleep until the next deadline.
+
+        Returns
+        -------
+        float
+            The seconds until the next timer is due, 0 if one is due and infinity if there are none.
+        """
+        with self._lock:
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return math.inf
+            return max(self._heap[0][0] - time.monotonic(), 0)
+
+    def clear(self) -> None:
+        """
+        Cancel every timer.
+        """
+        with self._lock:
+            for _, _, timer in self._heap:
+                timer.cancel()
+            self._heap.clear()
+
+    def __len__(self) -> int:
+        return sum(not timer.cancelled for _, _, timer in self._heap)
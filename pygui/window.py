@@ -1,16 +1,42 @@
 """
 File for handling the window.
 """
+import collections.abc
+import functools
+import math
 import os
-from typing import Callable, Dict, List, Literal, NamedTuple, Optional, Tuple, Type
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+)
 
-import darkdetect
-import glfw
-import imgui
-import OpenGL.GL as gl
-from imgui.integrations.glfw import GlfwRenderer
 import pygui
 from pygui.elements import Elements, State
+from pygui.images import TEXTURE_BUDGET, TextureCache
+from pygui.lazy import lazy_import
+from pygui.persist import Persistence
+from pygui.renderer import RendererName, renderer_class
+from pygui.replay import InputRecorder, apply_frame, read_recording
+from pygui.stats import Stats
+from pygui.tasks import Tasks
+from pygui.throttle import Throttle
+from pygui.timers import Timer, Timers
+
+if TYPE_CHECKING:
+    from imgui.integrations.glfw import GlfwRenderer
+
+glfw = lazy_import("glfw")
+gl = lazy_import("OpenGL.GL")
+imgui = lazy_import("imgui")
 
 KEY = Literal[
     "A",
@@ -54,6 +80,21 @@ KEY = Literal[
     "Shift",
 ]
 
+# These are GLFW's key and modifier values. They are written out so shortcuts can be
+# compiled without importing glfw. Letter and number keys use their ASCII value.
+MODIFIERS = {"Ctrl": 0x0002, "Alt": 0x0004, "Shift": 0x0001}
+MODIFIER_MASK = 0x0002 | 0x0004 | 0x0001
+MODIFIER_KEYS = {
+    "Ctrl": (341, 345),
+    "Alt": (342, 346),
+    "Shift": (340, 344),
+}
+KEY_MODIFIERS = {
+    keycode: MODIFIERS[name]
+    for name, keycodes in MODIFIER_KEYS.items()
+    for keycode in keycodes
+}
+
 
 class Frame(NamedTuple):
     """
@@ -65,6 +106,9 @@ class Frame(NamedTuple):
     width: int
     height: int
     position: Optional[Tuple[int, int]]
+    elements: Elements
+    stage: str
+    throttle: Optional[Throttle] = None
 
 
 class Menu(NamedTuple):
@@ -75,9 +119,113 @@ class Menu(NamedTuple):
     func: Callable
     title: str
     keys: Optional[List[KEY]]
+    subtext: str = ""
+    triggers: Tuple[int, ...] = ()
+    mods: int = 0
+    held: Tuple[int, ...] = ()
+
+
+def compile_shortcut(keys: List[KEY]) -> Tuple[Tuple[int, ...], int, Tuple[int, ...]]:
+    """
+    Compile a list of key names into GLFW keycodes.
+
+    Parameters
+    ----------
+    keys : List[KEY]
+        The keys of the shortcut.
+
+    Returns
+    -------
+    Tuple[Tuple[int, ...], int, Tuple[int, ...]]
+        The keycodes that trigger the shortcut, the modifier bits and the keycodes that have to be held down.
+
+    Raises
+    ------
+    ValueError
+        If one of the keys is not a valid key name.
+    """
+    mods = 0
+    keycodes = []
+    for key in keys:
+        if key in MODIFIERS:
+            mods |= MODIFIERS[key]
+        elif len(key) == 1 and key.isascii() and key.isalnum():
+            keycodes.append(ord(key.upper()))
+        else:
+            raise ValueError(f"Unknown key {key!r}")
+    if keycodes:
+        return (keycodes[-1],), mods, tuple(keycodes[:-1])
+    if mods:
+        return MODIFIER_KEYS[[key for key in keys if key in MODIFIERS][-1]], mods, ()
+    return (), 0, ()
 
 
 Theme = Type[Literal["light", "dark", "auto"]]
+Backend = Type[Literal["glfw", "headless"]]
+# pyimgui 1.4 can only load the glyph ranges that come with imgui. It has no way to pass custom ranges.
+GlyphRanges = Type[
+    Literal["default", "latin", "cyrillic", "japanese", "chinese", "chinese_full", "korean"]
+]
+
+HEADLESS_DELTA_TIME = 1 / 60
+# imgui keeps a pointer to this, so it has to stay alive. An empty name stops the headless backend from reading or writing imgui.ini.
+NO_INI_FILE = b""
+STATS_WIDTH = 900
+STATS_HEIGHT = 500
+STATS_FONT_SCALE = 0.5
+
+
+class Input(NamedTuple):
+    """
+    Scripted input for the headless backend.
+    """
+
+    frame: int
+    mouse_position: Optional[Tuple[float, float]] = None
+    mouse_down: Optional[Tuple[bool, ...]] = None
+    keys: Optional[List[KEY]] = None
+    text: str = ""
+
+
+@functools.lru_cache(maxsize=None)
+def detect_theme() -> Optional[str]:
+    """
+    Detect the theme of the operating system. The result is cached.
+
+    Returns
+    -------
+    Optional[str]
+        ``"light"``, ``"dark"`` or None if the theme could not be detected.
+    """
+    import darkdetect  # pylint: disable=import-outside-toplevel
+
+    if darkdetect.isLight():
+        return "light"
+    if darkdetect.isDark():
+        return "dark"
+    return None
+
+
+def wait_for_events(timeout: Optional[float]) -> bool:
+    """
+    Block until there are GLFW events or the timeout ran out.
+
+    Parameters
+    ----------
+    timeout : Optional[float]
+        How long to wait for in seconds, None waits until there are events.
+
+    Returns
+    -------
+    bool
+        If the wait was ended by events.
+    """
+    waited_from = glfw.get_time()
+    if timeout is None:
+        glfw.wait_events()
+    else:
+        glfw.wait_events_timeout(timeout)
+    return timeout is None or glfw.get_time() - waited_from < timeout
 
 
 class Window:
@@ -90,8 +238,26 @@ class Window:
     height: int = 600
     frames: List[Frame] = []
     menus: Dict[str, List[Menu]] = {}
+    shortcuts: Dict[Tuple[int, int], List[Menu]] = {}
     state: State = State()
     theme: Theme
+    idle: bool = False
+    max_idle_fps: float = 30
+    settle_frames: int = 3
+    font_sizes: Tuple[int, ...] = (48,)
+    glyph_ranges: Optional[GlyphRanges] = None
+    fonts: Dict[int, object] = {}
+    backend: Backend = "glfw"
+    stats: Stats
+    show_stats: bool = False
+    tasks: Tasks
+    timers: Timers
+    textures: TextureCache
+    _context = None
+    _font_atlas = None
+    persistence: Optional[Persistence] = None
+    record: Optional[str] = None
+    renderer: RendererName = "imgui"
 
     def __init__(
         self,
@@ -100,6 +266,17 @@ class Window:
         height: int = 600,
         font: str = None,
         theme: Theme = "auto",
+        idle: bool = False,
+        max_idle_fps: float = 30,
+        settle_frames: int = 3,
+        font_sizes: Tuple[int, ...] = (48,),
+        glyph_ranges: Optional[GlyphRanges] = None,
+        backend: Backend = "glfw",
+        show_stats: bool = False,
+        texture_budget: int = TEXTURE_BUDGET,
+        persist: Optional[str] = None,
+        record: Optional[str] = None,
+        renderer: RendererName = "imgui",
     ):
         self.title = title
         self.width = width
@@ -110,106 +287,932 @@ class Window:
             )
         self.font = font
         self.state = State()
+        self.state.on_post = self.request_redraw
         self.frames = []
         self.menus = {}
+        self.shortcuts = {}
+        self._pending_menus = []
         self.theme = theme
+        self.idle = idle
+        self.max_idle_fps = max_idle_fps
+        self.settle_frames = settle_frames
+        self.font_sizes = tuple(sorted(set(font_sizes)))
+        self.glyph_ranges = glyph_ranges
+        self.fonts = {}
+        self.backend = backend
+        self.stats = Stats()
+        self.show_stats = show_stats
+        self.tasks = Tasks(on_done=self.request_redraw)
+        self.timers = Timers(on_add=self.request_redraw)
+        self.textures = TextureCache(self.tasks, texture_budget)
+        self.persistence = None
+        if persist is not None:
+            self.persistence = Persistence(persist, self.state)
+            self.persistence.restore()
+        self.record = record
+        self.renderer = renderer
+        self._recorder = None
+        self._window = None
+        self._redraw_frames = 0
+        self._theme_applied = False
+        self._theme_thread = None
+        if theme == "auto":
+            self._theme_thread = threading.Thread(target=detect_theme, daemon=True)
+            self._theme_thread.start()
+
+    def request_redraw(self):
+        """
+        Ask the window to render again. Only needed when ``idle`` is enabled.
+
+        This can be called from any thread.
+        """
+        self._redraw_frames = max(self._redraw_frames, self.settle_frames, 1)
+        if self._window is not None:
+            glfw.post_empty_event()
+
+    def _default_font(self) -> object:
+        """
+        Get the loaded font closest to the default size of 48.
+
+        Returns
+        -------
+        object
+            The default font.
+        """
+        return self.fonts[min(self.fonts, key=lambda size: abs(size - 48))]
+
+    def _load_fonts(self, io) -> object:
+        """
+        Add the font to the atlas once for every font size.
+
+        Parameters
+        ----------
+        io : imgui.core._IO
+            The imgui IO object.
+
+        Returns
+        -------
+        object
+            The font closest to the default size of 48.
+        """
+        glyph_ranges = None
+        if self.glyph_ranges is not None:
+            glyph_ranges = getattr(io.fonts, f"get_glyph_ranges_{self.glyph_ranges}")()
+
+        self.fonts.clear()
+        for frame in self.frames:
+            frame.elements.texts.clear()
+        for size in self.font_sizes:
+            self.fonts[size] = io.fonts.add_font_from_file_ttf(
+                self.font, size, glyph_ranges=glyph_ranges
+            )
+        return self._default_font()
+
+    def _apply_theme(self) -> bool:
+        """
+        Apply the theme, if the automatic theme detection has finished.
+
+        Returns
+        -------
+        bool
+            If the theme was applied.
+        """
+        if self.theme == "auto":
+            if self._theme_thread is not None and self._theme_thread.is_alive():
+                return False
+            theme = detect_theme()
+        else:
+            theme = self.theme
+        if theme == "light":
+            imgui.style_colors_light()
+        elif theme == "dark":
+            imgui.style_colors_dark()
+        return True
+
+    def _key_callback(self, impl: "GlfwRenderer"):
+        """
+        Create a GLFW key callback that forwards to imgui and queues triggered shortcuts.
+
+        Parameters
+        ----------
+        impl : GlfwRenderer
+            The renderer to forward the key events to.
+
+        Returns
+        -------
+        Callable
+            The key callback.
+        """
+
+        def key_callback(window, key, scancode, action, mods):
+            impl.keyboard_callback(window, key, scancode, action, mods)
+            if self._recorder is not None and action != glfw.REPEAT:
+                self._recorder.key(key, action == glfw.PRESS, mods)
+            if action == glfw.PRESS:
+                self._queue_shortcuts(
+                    key, mods, lambda held: glfw.get_key(window, held) == glfw.PRESS
+                )
+
+        return key_callback
+
+    def _char_callback(self, impl: "GlfwRenderer"):
+        """
+        Create a GLFW character callback that forwards to imgui and records the character.
+
+        Parameters
+        ----------
+        impl : GlfwRenderer
+            The renderer to forward the characters to.
+
+        Returns
+        -------
+        Callable
+            The character callback.
+        """
+
+        def char_callback(window, char):
+            impl.char_callback(window, char)
+            if self._recorder is not None:
+                self._recorder.char(char)
+
+        return char_callback
+
+    def _queue_shortcuts(self, key: int, mods: int, is_down: Callable[[int], bool]):
+        """
+        Queue the menus whose shortcut was triggered by a key press.
+
+        Parameters
+        ----------
+        key : int
+            The keycode of the pressed key.
+        mods : int
+            The modifier bits that were held down.
+        is_down : Callable[[int], bool]
+            A function that checks if a keycode is held down.
+        """
+        mods = (mods | KEY_MODIFIERS.get(key, 0)) & MODIFIER_MASK
+        for menu in self.shortcuts.get((key, mods), ()):
+            if all(is_down(held) for held in menu.held):
+                self._pending_menus.append(menu)
+
+    def _wait_for_events(self, next_redraw: float):
+        """
+        Block until there is something new to render.
+
+        Parameters
+        ----------
+        next_redraw : float
+            The imgui time at which an element wants to be drawn again.
+        """
+        if wait_for_events(self._idle_timeout(next_redraw)):
+            self._settle()
+
+    def _idle_timeout(self, next_redraw: float) -> Optional[float]:
+        """
+        Work out how long the idle loop can wait before the next frame.
+
+        Parameters
+        ----------
+        next_redraw : float
+            The imgui time at which an element wants to be drawn again.
+
+        Returns
+        -------
+        Optional[float]
+            The timeout in seconds, None if only input should wake the window.
+        """
+        min_interval = 1 / self.max_idle_fps
+        if self._redraw_frames > 0:
+            self._redraw_frames -= 1
+            return min_interval
+        if next_redraw != math.inf:
+            return max(next_redraw - imgui.get_time(), min_interval)
+        return None
+
+    def _settle(self):
+        """
+        Keep drawing for a bit after input, so animations can settle.
+        """
+        self._redraw_frames = max(self._redraw_frames, self.settle_frames)
+
+    def _render_frames(self, font) -> float:
+        """
+        Run the menus and frames for one frame. This is shared by every backend.
+
+        Parameters
+        ----------
+        font : imgui.core._Font
+            The default font.
+
+        Returns
+        -------
+        float
+            The imgui time at which an element wants to be drawn again.
+
+        Raises
+        ------
+        TypeError
+            If a frame function is async.
+        """
+        state_version = self._begin_render(font)
+        for frame in self.frames:
+            if self._begin_frame(frame):
+                started = time.perf_counter()
+                result = self._call_frame(frame)
+                if isinstance(result, collections.abc.Awaitable):
+                    if isinstance(result, collections.abc.Coroutine):
+                        result.close()
+                    raise TypeError(
+                        f"The frame {frame.title!r} is async, use Window.run_async to start the window"
+                    )
+                self.stats.record(frame.stage, time.perf_counter() - started)
+            imgui.end()
+        return self._end_render(state_version)
+
+    async def _render_frames_async(self, font) -> float:
+        """
+        Run the menus and frames for one frame, awaiting the async frame functions.
+
+        Parameters
+        ----------
+        font : imgui.core._Font
+            The default font.
+
+        Returns
+        -------
+        float
+            The imgui time at which an element wants to be drawn again.
+        """
+        state_version = self._begin_render(font)
+        for frame in self.frames:
+            if self._begin_frame(frame):
+                started = time.perf_counter()
+                result = self._call_frame(frame)
+                if isinstance(result, collections.abc.Awaitable):
+                    await result
+                self.stats.record(frame.stage, time.perf_counter() - started)
+            imgui.end()
+        return self._end_render(state_version)
+
+    def _begin_render(self, font) -> int:
+        """
+        Deliver the finished tasks and run the menus.
+
+        Parameters
+        ----------
+        font : imgui.core._Font
+            The default font.
+
+        Returns
+        -------
+        int
+            The version of the state before anything was rendered.
+        """
+        imgui.push_font(font)
+        self.state.apply_posted()
+        state_version = self.state.version
+
+        started = time.perf_counter()
+        self.tasks.process_done()
+        self.timers.run_due()
+        pending_menus, self._pending_menus = self._pending_menus, []
+        for menu in pending_menus:
+            menu.func()
+
+        if len(self.menus) > 0:
+            if imgui.begin_main_menu_bar():
+                for menu_name, menu_items in self.menus.items():
+                    if imgui.begin_menu(menu_name, True):
+                        for menu_item in menu_items:
+                            if imgui.menu_item(menu_item.title, menu_item.subtext)[0]:
+                                menu_item.func()
+                        imgui.end_menu()
+                imgui.end_main_menu_bar()
+        self.stats.record("menus", time.perf_counter() - started)
+        return state_version
+
+    def _begin_frame(self, frame: Frame) -> bool:
+        """
+        Begin the imgui window of a frame. ``imgui.end`` has to be called even if it is not visible.
+
+        Parameters
+        ----------
+        frame : Frame
+            The frame to begin.
+
+        Returns
+        -------
+        bool
+            If the frame is visible. Collapsed and clipped frames are not.
+        """
+        if frame.height and frame.width:
+            imgui.set_next_window_size(frame.width, frame.height, imgui.FIRST_USE_EVER)
+        if len(frame.position or ()) == 2:
+            imgui.set_next_window_position(
+                frame.position[0], frame.position[1], imgui.FIRST_USE_EVER
+            )
+        expanded, _ = imgui.begin(frame.title)
+        frame.elements.reset()
+        return expanded
+
+    @staticmethod
+    def _call_frame(frame: Frame):
+        """
+        Call the function of a frame, or replay its last call if it is throttled.
+
+        Parameters
+        ----------
+        frame : Frame
+            The frame to call.
+
+        Returns
+        -------
+        Any
+            What the frame function returned.
+        """
+        if frame.throttle is None:
+            return frame.func(frame.elements)
+        return frame.throttle.run(frame.func)
+
+    def _end_render(self, state_version: int) -> float:
+        """
+        Finish rendering the frames.
+
+        Parameters
+        ----------
+        state_version : int
+            The version of the state before anything was rendered.
+
+        Returns
+        -------
+        float
+            The imgui time at which an element wants to be drawn again.
+        """
+        if self.show_stats:
+            self._render_stats()
+        imgui.pop_font()
+
+        self.state.notify()
+        if self.state.version != state_version:
+            self.request_redraw()
+        next_redraw = min((frame.elements.next_redraw for frame in self.frames), default=math.inf)
+        return min(next_redraw, imgui.get_time() + self.timers.timeout())
+
+    def _render_stats(self):
+        """
+        Render the stats overlay. Closing it sets ``show_stats`` to False.
+        """
+        imgui.set_next_window_size(STATS_WIDTH, STATS_HEIGHT, imgui.FIRST_USE_EVER)
+        _, self.show_stats = imgui.begin("Stats", True)
+        imgui.set_window_font_scale(STATS_FONT_SCALE)
+        imgui.text("Stage: p50 / p95 / p99 (ms)")
+        for stage, (p50, p95, p99) in self.stats.summary().items():
+            imgui.text(f"{stage}: {p50 * 1000:.2f} / {p95 * 1000:.2f} / {p99 * 1000:.2f}")
+        imgui.set_window_font_scale(1.0)
+        imgui.end()
 
-    def start(self):
+    def start(self, frames: Optional[int] = None, inputs: Optional[List[Input]] = None):
         """
         Start the window.
 
+        Parameters
+        ----------
+        frames : int, optional
+            How many frames to render before returning. Required for the headless backend, by default None
+        inputs : List[Input], optional
+            Scripted input for the headless backend, by default None
+
+        Raises
+        ------
+        Exception
+            If the OpenGL context or window could not be initialized.
+        ValueError
+            If the headless backend is used without a number of frames.
+        """
+        if self.backend == "headless":
+            self._start_headless(frames, inputs or [])
+            return
+
+        window, impl, font = self._open_window()
+
+        next_redraw = math.inf
+        frame_count = 0
+        while not glfw.window_should_close(window) and frame_count != frames:
+            if self.idle:
+                self._wait_for_events(next_redraw)
+            frame_started = time.perf_counter()
+            if not self.idle:
+                glfw.poll_events()
+            self._new_frame(impl, frame_started)
+            next_redraw = self._render_frames(font)
+            self._present(window, impl, frame_started)
+            frame_count += 1
+
+        self._close_window(impl)
+
+    async def run_async(self, frames: Optional[int] = None, fps: float = 60):
+        """
+        Run the window as a task on the running asyncio event loop.
+
+        Frame functions can be ``async def``, and other tasks run between frames.
+
+        Parameters
+        ----------
+        frames : int, optional
+            How many frames to render before returning, by default None
+        fps : float, optional
+            The frame rate to render at, by default 60
+
         Raises
         ------
         Exception
             If the OpenGL context or window could not be initialized.
+        ValueError
+            If the backend is not glfw.
         """
-        imgui.create_context()
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        if self.backend != "glfw":
+            raise ValueError("Window.run_async only supports the glfw backend")
 
-        if not glfw.init():
-            raise Exception("Could not initialize OpenGL context")
+        window, impl, font = self._open_window()
+        glfw.swap_interval(0)  # The frames are paced by the event loop instead.
+        frame_time = 1 / fps
+
+        try:
+            frame_count = 0
+            while not glfw.window_should_close(window) and frame_count != frames:
+                frame_started = time.perf_counter()
+                glfw.poll_events()
+                self._new_frame(impl, frame_started)
+                await self._render_frames_async(font)
+                self._present(window, impl, frame_started)
+                frame_count += 1
+                await asyncio.sleep(
+                    max(frame_time - (time.perf_counter() - frame_started), 0)
+                )
+        finally:
+            self._close_window(impl)
+
+    @staticmethod
+    def start_all(*windows: "Window", frames: Optional[int] = None):
+        """
+        Run several windows in one loop. They share an OpenGL context and the font atlas of the first window.
+
+        The events of every window are polled once, then every open window renders its frame.
+
+        Parameters
+        ----------
+        *windows : Window
+            The windows to run.
+        frames : int, optional
+            How many frames to render before returning, by default None
+
+        Raises
+        ------
+        Exception
+            If the OpenGL context or a window could not be initialized.
+        ValueError
+            If a window does not use the glfw backend.
+        """
+        if any(window.backend != "glfw" for window in windows):
+            raise ValueError("Window.start_all only supports the glfw backend")
+        if not windows:
+            return
+
+        opened = []
+        for window in windows:
+            opened.append(window._open_window(windows[0] if opened else None))
+        # Only the last window waits for the vertical sync, so the windows don't wait for it in turn.
+        for glfw_window, _, _ in opened[:-1]:
+            glfw.make_context_current(glfw_window)
+            glfw.swap_interval(0)
+
+        next_redraws = [math.inf] * len(windows)
+        running = list(range(len(windows)))
+        frame_count = 0
+        try:
+            while running and frame_count != frames:
+                if all(windows[index].idle for index in running):
+                    timeouts = []
+                    for index in running:
+                        imgui.set_current_context(windows[index]._context)
+                        timeouts.append(windows[index]._idle_timeout(next_redraws[index]))
+                    timeouts = [timeout for timeout in timeouts if timeout is not None]
+                    if wait_for_events(min(timeouts) if timeouts else None):
+                        for index in running:
+                            windows[index]._settle()
+                else:
+                    glfw.poll_events()
+
+                for index in list(running):
+                    window = windows[index]
+                    glfw_window, impl, font = opened[index]
+                    if glfw.window_should_close(glfw_window):
+                        # The window is hidden instead of destroyed, since the other windows may use its font texture.
+                        glfw.hide_window(glfw_window)
+                        running.remove(index)
+                        continue
+                    frame_started = time.perf_counter()
+                    glfw.make_context_current(glfw_window)
+                    imgui.set_current_context(window._context)
+                    window._new_frame(impl, frame_started)
+                    next_redraws[index] = window._render_frames(font)
+                    window._present(glfw_window, impl, frame_started)
+                frame_count += 1
+        finally:
+            # The first window owns the font texture, so it is closed last.
+            for window, (glfw_window, impl, _) in reversed(list(zip(windows, opened))):
+                glfw.make_context_current(glfw_window)
+                imgui.set_current_context(window._context)
+                window._close_window(impl, terminate=False)
+            glfw.terminate()
+
+    def _open_window(self, shared: Optional["Window"] = None) -> Tuple[object, "GlfwRenderer", object]:
+        """
+        Create the GLFW window, the imgui context and the fonts.
+
+        Parameters
+        ----------
+        shared : Window, optional
+            An open window to share the OpenGL context and the font atlas with, by default None
+
+        Returns
+        -------
+        Tuple[object, GlfwRenderer, object]
+            The GLFW window, the renderer and the default font.
+
+        Raises
+        ------
+        Exception
+            If the OpenGL context or window could not be initialized.
+        """
+        if shared is None:
+            self._context = imgui.create_context()
+            if not glfw.init():
+                raise Exception("Could not initialize OpenGL context")
+        else:
+            self._context = imgui.create_context(shared._font_atlas)
+        imgui.set_current_context(self._context)
+        self._reset_throttles()
 
         glfw.window_hint(glfw.CONTEXT_VERSION_MAJOR, 3)
         glfw.window_hint(glfw.CONTEXT_VERSION_MINOR, 3)
         glfw.window_hint(glfw.OPENGL_PROFILE, glfw.OPENGL_CORE_PROFILE)
         glfw.window_hint(glfw.OPENGL_FORWARD_COMPAT, gl.GL_TRUE)
 
-        window = glfw.create_window(self.width, self.height, self.title, None, None)
+        window = glfw.create_window(
+            self.width, self.height, self.title, None, shared and shared._window
+        )
         glfw.make_context_current(window)
 
         if not window:
             glfw.terminate()
             raise Exception("Could not initialize Window")
+        self._window = window
 
-        impl = GlfwRenderer(window)
+        impl = renderer_class(self.renderer)(window, owns_font_texture=shared is None)
+        glfw.set_key_callback(window, self._key_callback(impl))
+        glfw.set_char_callback(window, self._char_callback(impl))
+        if self.record is not None:
+            self._recorder = InputRecorder(self.record)
 
-        if (darkdetect.isLight() and self.theme == "auto") or self.theme == "light":
-            imgui.style_colors_light()
-        elif (darkdetect.isDark() and self.theme == "auto") or self.theme == "dark":
-            imgui.style_colors_dark()
+        self._theme_applied = self._apply_theme()
 
         io = imgui.get_io()
-        font = io.fonts.add_font_from_file_ttf(self.font, 48)
-        impl.refresh_font_texture()
-
-        while not glfw.window_should_close(window):
-            glfw.poll_events()
-            impl.process_inputs()
-            imgui.new_frame()
-
-            gl.glClearColor(0.1, 0.1, 0.1, 1)
-            gl.glClear(gl.GL_COLOR_BUFFER_BIT)
-
-            imgui.push_font(font)
-
-            if len(self.menus) > 0:
-                for menu_items in self.menus.values():
-                    for menu in menu_items:
-                        if menu.keys is not None:
-                            if all(
-                                i == "Ctrl"
-                                and io.key_ctrl
-                                or i == "Alt"
-                                and io.key_alt
-                                or i == "Shift"
-                                and io.key_shift
-                                or len(i) == 1
-                                and io.keys_down[getattr(glfw, f"KEY_{i.upper()}")]
-                                for i in menu.keys
-                            ):
-                                menu.func()
-
-                if imgui.begin_main_menu_bar():
-                    for menu_name, menu_items in self.menus.items():
-                        if imgui.begin_menu(menu_name, True):
-                            for menu_item in menu_items:
-                                subtext = " + ".join(menu_item.keys or [])
-                                if imgui.menu_item(menu_item.title, subtext)[0]:
-                                    menu_item.func()
-                            imgui.end_menu()
-                    imgui.end_main_menu_bar()
-
-            for frame in self.frames:
-                if frame.height and frame.width:
-                    imgui.set_next_window_size(
-                        frame.width, frame.height, imgui.FIRST_USE_EVER
-                    )
-                if len(frame.position or ()) == 2:
-                    imgui.set_next_window_position(
-                        frame.position[0], frame.position[1], imgui.FIRST_USE_EVER
-                    )
-                imgui.begin(frame.title)
-                frame.func(Elements(self.state))
-                imgui.end()
-            imgui.pop_font()
+        self._font_atlas = io.fonts
+        if shared is None:
+            font = self._load_fonts(io)
+            impl.refresh_font_texture()
+        else:
+            self.fonts.clear()
+            self.fonts.update(shared.fonts)
+            font = self._default_font()
+        if self.persistence is not None:
+            self.persistence.start()
+        # Nothing has been drawn yet, so the first frames must not wait for an event.
+        self._redraw_frames = max(self.settle_frames, 1)
+        return window, impl, font
 
-            imgui.render()
-            impl.render(imgui.get_draw_data())
-            glfw.swap_buffers(window)
+    def _close_window(self, impl: "GlfwRenderer", terminate: bool = True):
+        """
+        Destroy the GLFW window.
 
+        Parameters
+        ----------
+        impl : GlfwRenderer
+            The renderer of the window.
+        terminate : bool, optional
+            Wether to shut GLFW down as well, by default True
+        """
+        self._window = None
+        self.tasks.shutdown()
+        self.textures.clear()
+        if self.persistence is not None:
+            self.persistence.stop()
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
         impl.shutdown()
-        glfw.terminate()
+        if terminate:
+            glfw.terminate()
+
+    def _new_frame(self, impl: "GlfwRenderer", frame_started: float):
+        """
+        Pass the polled events to imgui and start a new frame.
+
+        Parameters
+        ----------
+        impl : GlfwRenderer
+            The renderer of the window.
+        frame_started : float
+            The time the frame started.
+        """
+        impl.process_inputs()
+        if self._recorder is not None:
+            self._recorder.frame(imgui.get_io())
+        self.stats.record("events", time.perf_counter() - frame_started)
+        if not self._theme_applied:
+            self._theme_applied = self._apply_theme()
+            self._redraw_frames = max(self._redraw_frames, int(not self._theme_applied))
+        imgui.new_frame()
+
+        gl.glClearColor(0.1, 0.1, 0.1, 1)
+        gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+
+    def _present(self, window, impl: "GlfwRenderer", frame_started: float):
+        """
+        Render the frame and show it.
+
+        Parameters
+        ----------
+        window : glfw._GLFWwindow
+            The GLFW window.
+        impl : GlfwRenderer
+            The renderer of the window.
+        frame_started : float
+            The time the frame started.
+        """
+        started = time.perf_counter()
+        imgui.render()
+        self.stats.record("imgui.render", time.perf_counter() - started)
+        started = time.perf_counter()
+        impl.render(imgui.get_draw_data())
+        self.stats.record("impl.render", time.perf_counter() - started)
+        self.textures.evict()
+        started = time.perf_counter()
+        glfw.swap_buffers(window)
+        self.stats.record("swap_buffers", time.perf_counter() - started)
+        self.stats.record("total", time.perf_counter() - frame_started)
+
+    def _start_headless(self, frames: Optional[int], inputs: List[Input]):
+        """
+        Run the window without a display. The draw data is built but never drawn.
+
+        Parameters
+        ----------
+        frames : int
+            How many frames to render.
+        inputs : List[Input]
+            Scripted input.
+
+        Raises
+        ------
+        ValueError
+            If no number of frames was given.
+        """
+        if frames is None:
+            raise ValueError("The headless backend needs a number of frames to render")
+
+        context, io, font = self._open_headless()
+
+        inputs_by_frame = {}
+        for scripted_input in inputs:
+            inputs_by_frame.setdefault(scripted_input.frame, []).append(scripted_input)
+
+        held_keys = set()
+        for frame_count in range(frames):
+            for key in held_keys:
+                io.keys_down[key] = False
+            held_keys.clear()
+            io.key_ctrl = io.key_alt = io.key_shift = False
+            frame_started = time.perf_counter()
+            for scripted_input in inputs_by_frame.get(frame_count, ()):
+                self._apply_input(io, scripted_input, held_keys)
+            self.stats.record("events", time.perf_counter() - frame_started)
+            self._render_headless(font, frame_started)
 
-    def frame(self, title: str, width: int = None, height: int = None, position: Optional[Tuple[int, int]] = None):
+        self._close_headless(context)
+
+    def replay(self, path: str, realtime: bool = False) -> Dict[str, Tuple[float, float, float]]:
+        """
+        Render the frames with input recorded by the ``record`` option, without a display.
+
+        Parameters
+        ----------
+        path : str
+            The path of the recording.
+        realtime : bool, optional
+            Wether to wait as long as the recorded frames took, instead of rendering as fast as possible, by default False
+
+        Returns
+        -------
+        Dict[str, Tuple[float, float, float]]
+            The p50, p95 and p99 of every stage of the replayed frames in seconds.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a recording.
+        """
+        self.stats.clear()
+        context, io, font = self._open_headless()
+        for recorded in read_recording(path):
+            frame_started = time.perf_counter()
+            apply_frame(io, recorded)
+            for key, down, mods in recorded.keys:
+                if down:
+                    self._queue_shortcuts(key, mods, io.keys_down.__getitem__)
+            self.stats.record("events", time.perf_counter() - frame_started)
+            self._render_headless(font, frame_started)
+            if realtime:
+                time.sleep(max(recorded.delta_time - (time.perf_counter() - frame_started), 0))
+        self._close_headless(context)
+        return self.stats.summary()
+
+    def _reset_throttles(self):
+        """
+        Reset the throttled frames. Their update times are imgui times, which start at 0 in every new context.
+        """
+        for frame in self.frames:
+            if frame.throttle is not None:
+                frame.throttle.reset()
+
+    def _open_headless(self) -> Tuple[object, object, object]:
+        """
+        Create the imgui context and the font atlas for rendering without a display.
+
+        Returns
+        -------
+        Tuple[object, object, object]
+            The imgui context, the imgui IO object and the default font.
+        """
+        context = imgui.create_context()
+        self._reset_throttles()
+        self.textures.upload = False
+        io = imgui.get_io()
+        io.ini_file_name = NO_INI_FILE
+        io.display_size = self.width, self.height
+        io.delta_time = HEADLESS_DELTA_TIME
+        font = self._load_fonts(io)
+        io.fonts.get_tex_data_as_rgba32()  # Builds the font atlas
+        self._theme_applied = False
+        if self.persistence is not None:
+            self.persistence.start()
+        return context, io, font
+
+    def _render_headless(self, font, frame_started: float):
+        """
+        Render a frame without drawing it.
+
+        Parameters
+        ----------
+        font : imgui.core._Font
+            The default font.
+        frame_started : float
+            The time the frame started.
+        """
+        if not self._theme_applied:
+            self._theme_applied = self._apply_theme()
+        imgui.new_frame()
+        self._render_frames(font)
+        started = time.perf_counter()
+        imgui.render()
+        imgui.get_draw_data()
+        self.stats.record("imgui.render", time.perf_counter() - started)
+        self.textures.evict()
+        self.stats.record("total", time.perf_counter() - frame_started)
+
+    def _close_headless(self, context):
+        """
+        Destroy the imgui context of the headless backend.
+
+        Parameters
+        ----------
+        context : imgui.core._ImGuiContext
+            The imgui context.
+        """
+        self.tasks.shutdown()
+        self.textures.clear()
+        self.textures.upload = True
+        if self.persistence is not None:
+            self.persistence.stop()
+        imgui.destroy_context(context)
+
+    def _apply_input(self, io, scripted_input: Input, held_keys: set):
+        """
+        Apply scripted input to imgui and queue the triggered shortcuts.
+
+        Parameters
+        ----------
+        io : imgui.core._IO
+            The imgui IO object.
+        scripted_input : Input
+            The input to apply.
+        held_keys : set
+            The keycodes that are pressed this frame. Pressed keys are added to it.
+        """
+        if scripted_input.mouse_position is not None:
+            io.mouse_pos = scripted_input.mouse_position
+        if scripted_input.mouse_down is not None:
+            for button, down in enumerate(scripted_input.mouse_down):
+                io.mouse_down[button] = down
+        for character in scripted_input.text:
+            io.add_input_character(ord(character))
+        if scripted_input.keys:
+            triggers, mods, held = compile_shortcut(scripted_input.keys)
+            io.key_ctrl = bool(mods & MODIFIERS["Ctrl"])
+            io.key_alt = bool(mods & MODIFIERS["Alt"])
+            io.key_shift = bool(mods & MODIFIERS["Shift"])
+            for key in held + triggers[:1]:
+                io.keys_down[key] = True
+                held_keys.add(key)
+            if triggers:
+                self._queue_shortcuts(triggers[0], mods, held_keys.__contains__)
+
+    def submit(self, func: Callable, *args, **kwargs):
+        """
+        Run a function in the background. The results are delivered on the next frame.
+
+        Parameters
+        ----------
+        func : Callable
+            The function to run.
+        *args
+            The arguments to pass to the function.
+        **kwargs
+            The keyword arguments to pass to the function, and the ``callback``, ``error_callback``, ``key`` and ``process`` options of ``Tasks.submit``.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            The future of the function.
+        """
+        return self.tasks.submit(func, *args, **kwargs)
+
+    def after(self, delay: float, func: Callable, *args) -> Timer:
+        """
+        Call a function on the UI thread after a delay. This can be called from any thread.
+
+        Parameters
+        ----------
+        delay : float
+            How many seconds to wait before calling the function.
+        func : Callable
+            The function to call.
+        *args
+            The arguments to pass to the function.
+
+        Returns
+        -------
+        Timer
+            The timer. Call ``cancel`` on it to stop it.
+        """
+        return self.timers.after(delay, func, *args)
+
+    def every(self, interval: float, func: Callable, *args) -> Timer:
+        """
+        Call a function on the UI thread every interval. This can be called from any thread.
+
+        Parameters
+        ----------
+        interval : float
+            How many seconds to wait between the calls.
+        func : Callable
+            The function to call.
+        *args
+            The arguments to pass to the function.
+
+        Returns
+        -------
+        Timer
+            The timer. Call ``cancel`` on it to stop it.
+
+        Raises
+        ------
+        ValueError
+            If the interval is not positive.
+        """
+        return self.timers.every(interval, func, *args)
+
+    def frame(
+        self,
+        title: str,
+        width: int = None,
+        height: int = None,
+        position: Optional[Tuple[int, int]] = None,
+        max_hz: Optional[float] = None,
+    ):
         """
         Create a decorator to create a frame.
 
@@ -221,15 +1224,33 @@ class Window:
             The width of the frame, by default None
         height : int, optional
             The height of the frame, by default None
+        position : Tuple[int, int], optional
+            The position of the frame, by default None
+        max_hz : float, optional
+            Call the function at most this many times a second. In between the elements from the last call are displayed again, by default None
 
         Returns
         -------
         Callable
             The decorator.
         """
-        return lambda func: self.frames.append(
-            Frame(func=func, title=title, width=width, height=height, position=position)
-        )
+
+        def decorator(func):
+            elements = Elements(self.state, self.fonts, self.tasks, self.textures)
+            self.frames.append(
+                Frame(
+                    func=func,
+                    title=title,
+                    width=width,
+                    height=height,
+                    position=position,
+                    elements=elements,
+                    stage=f"frame: {title}",
+                    throttle=None if max_hz is None else Throttle(max_hz, elements),
+                )
+            )
+
+        return decorator
 
     def menu(self, category: str, title: str, keys: List[KEY] = None):
         """
@@ -248,10 +1269,29 @@ class Window:
         -------
         Callable
             The decorator.
+
+        Raises
+        ------
+        ValueError
+            If one of the keys is not a valid key name.
         """
-        return lambda func: self.menus.setdefault(category, []).append(
-            Menu(func=func, title=title, keys=keys)
-        )
+        triggers, mods, held = compile_shortcut(keys or [])
+
+        def decorator(func):
+            menu = Menu(
+                func=func,
+                title=title,
+                keys=keys,
+                subtext=" + ".join(keys or []),
+                triggers=triggers,
+                mods=mods,
+                held=held,
+            )
+            self.menus.setdefault(category, []).append(menu)
+            for trigger in triggers:
+                self.shortcuts.setdefault((trigger, mods), []).append(menu)
+
+        return decorator
 
     def __repr__(self) -> str:
         return f"Window(title={self.title!r}, width={self.width}, height={self.height})"
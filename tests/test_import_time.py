@@ -0,0 +1,61 @@
+"""
+Checks that importing pygui stays fast.
+"""
+import os
+import re
+import subprocess
+import sys
+import unittest
+
+IMPORT_BUDGET = 0.05
+RUNS = 5
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_time() -> float:
+    """
+    Import pygui in a new interpreter and read how long it took from ``-X importtime``.
+
+    Returns
+    -------
+    float
+        The cumulative import time of pygui in seconds.
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import pygui"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    match = re.search(r"^import time:\s+\d+ \|\s+(\d+) \| pygui$", result.stderr, re.MULTILINE)
+    return int(match.group(1)) / 1e6
+
+
+class ImportTimeTest(unittest.TestCase):
+    def test_import_is_under_budget(self):
+        # The first run writes the bytecode cache, the fastest of the others is the least noisy.
+        import_time()
+        best = min(import_time() for _ in range(RUNS))
+        self.assertLess(best, IMPORT_BUDGET, f"import pygui took {best * 1000:.1f} ms")
+
+    def test_heavy_modules_are_not_imported(self):
+        code = (
+            "import sys, pygui; "
+            "print(' '.join(name for name in ('glfw', 'imgui', 'OpenGL', 'darkdetect', 'logging', "
+            "'concurrent.futures') if type(sys.modules.get(name)).__name__ == 'module'))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            env=dict(os.environ, PYTHONPATH=ROOT),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()